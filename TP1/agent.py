@@ -1,11 +1,16 @@
 from collections import deque
+import heapq
 import time
 import numpy as np
+from board import expand_packed, packed_dtype, sorted_contains
+from heuristics import ManhattanLinearConflict, MisplacedTiles
+from parallel_astar import hda_star
+from visited import visited_nbytes
 
 
 class Agent:
     """
-    Agente que resolve o problema do 15-puzzle usando BFS, DFS ou A*.
+    Agente que resolve o problema do 15-puzzle usando BFS, BFS bidirecional, DFS, A*, IDA* ou HDA*.
     """
 
     def __init__(self, board):
@@ -14,9 +19,25 @@ class Agent:
         """
         self.board = board
 
-    def solve_with_bfs(self):
+    def reconstruct_path(self, parents, state):
+        """
+        Reconstrói o caminho até `state` seguindo os ponteiros para o pai.
+        - `parents`: dicionário {estado: estado pai}, com o estado inicial apontando para None.
+        Retorna a lista de estados (já decodificados) do inicial até `state`.
+        """
+        path = []
+        while state is not None:
+            path.append(state)
+            state = parents[state]
+        path.reverse()
+        return [self.board.unpack(step) for step in path]
+
+    def solve_with_bfs(self, tracer=None, visited=None):
         """
         Resolve o problema usando o algoritmo BFS.
+        - `tracer`: `SearchTracer` opcional, notificado a cada expansão (camada = profundidade).
+        - `visited`: conjunto de visitados vazio a ser usado no lugar do dicionário padrão,
+          como uma `PackedStateTable` (ver `visited.py`).
         """
         if not self.board.check_is_solvable():
             return {
@@ -24,38 +45,339 @@ class Agent:
                 "nodes_expanded": 0,
                 "moves": 0,
                 "time": 0,
+                "max_frontier": 0,
+                "visited_size": 0,
+                "visited_bytes": 0,
             }
 
-        initial_state = self.board.board.flatten().tolist()
-        goal_state = list(range(1, self.board.rows * self.board.cols)) + [0]
+        # Estados codificados em inteiros (ver `Board.to_packed`)
+        initial_state, initial_blank = self.board.to_packed()
+        goal_state = self.board.goal_packed
 
-        queue = deque([(initial_state, [])])  # Fila para BFS: (estado, caminho)
-        visited = set()
+        queue = deque([(initial_state, initial_blank, None)])  # Fila para BFS: (estado, posição do 0, pai)
+        if visited is None:
+            visited = {}  # Estados expandidos e seus pais, usados para reconstruir o caminho
         nodes_expanded = 0
+        max_frontier = 1
+        depths = {None: -1}  # Profundidade de cada estado, mantida só com `tracer`
 
         start_time = time.time()
 
         while queue:
-            current_state, path = queue.popleft()
-            state_tuple = tuple(current_state)
+            current_state, blank, parent = queue.popleft()
 
-            if state_tuple in visited:
+            if current_state in visited:
+                if tracer is not None:
+                    tracer.duplicate()
                 continue
-            visited.add(state_tuple)
+            visited[current_state] = parent
             nodes_expanded += 1
+            if tracer is not None:
+                depths[current_state] = depths[parent] + 1
+                tracer.expanded(depths[current_state], len(queue))
 
             if current_state == goal_state:
+                solution = self.reconstruct_path(visited, current_state)
                 end_time = time.time()
                 return {
-                    "solution": path + [current_state],
+                    "solution": solution,
                     "nodes_expanded": nodes_expanded,
-                    "moves": len(path),
+                    "moves": len(solution) - 1,
                     "time": end_time - start_time,
+                    "max_frontier": max_frontier,
+                    "visited_size": len(visited),
+                    "visited_bytes": visited_nbytes(visited),
                 }
 
-            for neighbors in self.board.get_neighbors(current_state):
-                if tuple(neighbors) not in visited:
-                    queue.append((neighbors, path + [current_state]))
+            neighbors = self.board.get_packed_neighbors(current_state, blank)
+            frontier_before = len(queue)
+            for neighbor, neighbor_blank in neighbors:
+                if neighbor not in visited:
+                    queue.append((neighbor, neighbor_blank, current_state))
+            max_frontier = max(max_frontier, len(queue))
+            if tracer is not None:
+                tracer.generated(len(queue) - frontier_before)
+                tracer.duplicate(len(neighbors) - (len(queue) - frontier_before))
+
+        end_time = time.time()
+        return {
+            "solution": None,
+            "nodes_expanded": nodes_expanded,
+            "moves": 0,
+            "time": end_time - start_time,
+            "max_frontier": max_frontier,
+            "visited_size": len(visited),
+            "visited_bytes": visited_nbytes(visited),
+        }
+
+    def solve_with_bidirectional_bfs(self):
+        """
+        Resolve o problema usando BFS bidirecional: uma busca parte do estado inicial e
+        outra do objetivo, sempre expandindo por completo a camada da menor fronteira.
+        Quando as buscas se encontram, o caminho ótimo é montado juntando as duas metades.
+        """
+        if not self.board.check_is_solvable():
+            return {
+                "solution": None,
+                "nodes_expanded": 0,
+                "moves": 0,
+                "time": 0,
+                "max_frontier": 0,
+                "visited_size": 0,
+            }
+
+        initial_state, initial_blank = self.board.to_packed()
+        goal_state = self.board.goal_packed
+        goal_blank = self.board.rows * self.board.cols - 1
+
+        # Pais e distâncias de cada lado; o pai do lado do objetivo aponta em direção ao objetivo
+        forward = {initial_state: (None, 0)}
+        backward = {goal_state: (None, 0)}
+        forward_frontier = [(initial_state, initial_blank)]
+        backward_frontier = [(goal_state, goal_blank)]
+        nodes_expanded = 0
+        max_frontier = 2
+        meeting = initial_state if initial_state == goal_state else None
+
+        start_time = time.time()
+
+        while meeting is None and forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, visited, other = forward_frontier, forward, backward
+            else:
+                frontier, visited, other = backward_frontier, backward, forward
+
+            # Expande a camada inteira e guarda o melhor ponto de encontro dela
+            best_cost = None
+            next_frontier = []
+            for current_state, blank in frontier:
+                nodes_expanded += 1
+                depth = visited[current_state][1] + 1
+                for neighbor, neighbor_blank in self.board.get_packed_neighbors(current_state, blank):
+                    if neighbor in visited:
+                        continue
+                    visited[neighbor] = (current_state, depth)
+                    next_frontier.append((neighbor, neighbor_blank))
+                    if neighbor in other:
+                        cost = depth + other[neighbor][1]
+                        if best_cost is None or cost < best_cost:
+                            best_cost, meeting = cost, neighbor
+
+            if visited is forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+            max_frontier = max(max_frontier, len(forward_frontier) + len(backward_frontier))
+
+        if meeting is None:
+            end_time = time.time()
+            return {
+                "solution": None,
+                "nodes_expanded": nodes_expanded,
+                "moves": 0,
+                "time": end_time - start_time,
+                "max_frontier": max_frontier,
+                "visited_size": len(forward) + len(backward),
+            }
+
+        # Metade inicial -> encontro pelos pais da busca direta; encontro -> objetivo pela reversa
+        path = []
+        state = meeting
+        while state is not None:
+            path.append(state)
+            state = forward[state][0]
+        path.reverse()
+        state = backward[meeting][0]
+        while state is not None:
+            path.append(state)
+            state = backward[state][0]
+        solution = [self.board.unpack(step) for step in path]
+
+        end_time = time.time()
+        return {
+            "solution": solution,
+            "nodes_expanded": nodes_expanded,
+            "moves": len(solution) - 1,
+            "time": end_time - start_time,
+            "max_frontier": max_frontier,
+            "visited_size": len(forward) + len(backward),
+        }
+
+    def solve_with_vectorized_bfs(self):
+        """
+        BFS síncrona por camadas, vetorizada com numpy: cada camada é um array de estados
+        codificados, e os filhos de toda a camada são gerados de uma vez, um movimento do
+        0 por vez (ver `expand_packed`).
+        - As duplicatas são removidas com `np.unique` e por busca binária nas duas
+          camadas anteriores, as únicas onde um filho já visitado pode estar.
+        - Estados de até 64 bits (até 4x4) usam `uint64`; maiores usam arrays de inteiros Python.
+        - Cada camada guarda o pai de cada estado, para reconstruir o caminho ótimo.
+        """
+        if not self.board.check_is_solvable():
+            return {
+                "solution": None,
+                "nodes_expanded": 0,
+                "moves": 0,
+                "time": 0,
+                "max_frontier": 0,
+                "visited_size": 0,
+            }
+
+        rows, cols = self.board.rows, self.board.cols
+        dtype = packed_dtype(rows, cols)
+        initial_state, initial_blank = self.board.to_packed()
+        goal_state = self.board.goal_packed
+
+        # Cada camada: (estados ordenados, posições do 0, pais)
+        layers = [(np.array([initial_state], dtype=dtype), np.array([initial_blank]), np.array([0], dtype=dtype))]
+        nodes_expanded = 0
+        max_frontier = 1
+        visited_size = 1
+
+        start_time = time.time()
+
+        while len(layers[-1][0]):
+            states, blanks, _ = layers[-1]
+            if sorted_contains(states, np.array([goal_state], dtype=dtype))[0]:
+                path = [goal_state]
+                for layer_states, _, parents in reversed(layers[1:]):
+                    path.append(int(parents[np.searchsorted(layer_states, np.array([path[-1]], dtype=dtype))[0]]))
+                path.reverse()
+                solution = [self.board.unpack(state) for state in path]
+                end_time = time.time()
+                return {
+                    "solution": solution,
+                    "nodes_expanded": nodes_expanded,
+                    "moves": len(solution) - 1,
+                    "time": end_time - start_time,
+                    "max_frontier": max_frontier,
+                    "visited_size": visited_size,
+                }
+
+            nodes_expanded += len(states)
+            children, child_blanks, parent_index = expand_packed(states, blanks, rows, cols)
+            parents = states[parent_index]
+
+            children, first = np.unique(children, return_index=True)
+            child_blanks, parents = child_blanks[first], parents[first]
+            new = ~sorted_contains(states, children)
+            if len(layers) > 1:
+                new &= ~sorted_contains(layers[-2][0], children)
+            layers.append((children[new], child_blanks[new], parents[new]))
+            max_frontier = max(max_frontier, int(new.sum()))
+            visited_size += int(new.sum())
+
+        end_time = time.time()
+        return {
+            "solution": None,
+            "nodes_expanded": nodes_expanded,
+            "moves": 0,
+            "time": end_time - start_time,
+            "max_frontier": max_frontier,
+            "visited_size": visited_size,
+        }
+
+    def solve_with_dfs(self, max_depth=20, table_size=0, tracer=None):
+        """
+        Resolve o problema usando DFS com aprofundamento iterativo: DFS limitadas a
+        profundidades crescentes (com a paridade da solução), até `max_depth`. A primeira
+        solução é ótima.
+        - A pilha guarda só o índice do próximo movimento de cada nível, e o estado e a
+          posição do 0 de cada nível ficam em listas pré-alocadas, atualizadas no lugar.
+        - Ciclos são evitados apenas no caminho atual (movimento de volta e estados já no
+          caminho), sem conjunto de visitados global.
+        - `table_size`: se positivo, usa uma tabela de transposição com até esse número de
+          estados, que descarta estados já alcançados na iteração com profundidade menor ou igual.
+        - `tracer`: `SearchTracer` opcional, notificado a cada expansão (camada = profundidade
+          do nó expandido) e a cada filho gerado.
+        """
+        if not self.board.check_is_solvable():
+            return {
+                "solution": None,
+                "nodes_expanded": 0,
+                "moves": 0,
+                "time": 0,
+                "max_frontier": 0,
+                "visited_size": 0,
+            }
+
+        move_table = self.board.move_table
+        bits, tile_mask = self.board.bits, self.board.tile_mask
+        initial_state, initial_blank = self.board.to_packed()
+        goal_state = self.board.goal_packed
+
+        states = [initial_state] + [0] * max_depth  # Estado de cada nível do caminho atual
+        blanks = [initial_blank] + [0] * max_depth
+        next_move = [0] * (max_depth + 1)  # Pilha: próximo movimento a tentar em cada nível
+        nodes_expanded = 0
+        max_reached = 0
+        table = {}
+
+        start_time = time.time()
+
+        # O grafo de estados é bipartido: toda solução tem a paridade da distância do 0 até a
+        # sua posição final, que também é um limite inferior. Os limites começam nela e sobem de 2 em 2.
+        cols = self.board.cols
+        goal_blank = self.board.rows * cols - 1
+        first_limit = abs(initial_blank // cols - goal_blank // cols) + abs(initial_blank % cols - goal_blank % cols)
+
+        for limit in range(first_limit, max_depth + 1, 2):
+            on_path = {initial_state}
+            table = {}
+            next_move[0] = 0
+            depth = 0
+            while depth >= 0:
+                state = states[depth]
+                if state == goal_state:
+                    end_time = time.time()
+                    return {
+                        "solution": [self.board.unpack(step) for step in states[:depth + 1]],
+                        "nodes_expanded": nodes_expanded,
+                        "moves": depth,
+                        "time": end_time - start_time,
+                        "max_frontier": max_reached,
+                        "visited_size": len(table),
+                    }
+
+                blank = blanks[depth]
+                targets = move_table[blank]
+                if depth == limit or next_move[depth] == len(targets):
+                    on_path.discard(state)
+                    depth -= 1
+                    continue
+                if tracer is not None and next_move[depth] == 0:
+                    # Início da expansão do nó: camada = g(n) = profundidade, fronteira = caminho atual
+                    tracer.expanded(depth, depth + 1)
+
+                target = targets[next_move[depth]]
+                next_move[depth] += 1
+                if depth and target == blanks[depth - 1]:
+                    continue  # Desfaria o movimento anterior
+
+                shift = bits * target
+                tile = (state >> shift) & tile_mask
+                child = state - (tile << shift) + (tile << (bits * blank))
+                if child in on_path:
+                    if tracer is not None:
+                        tracer.duplicate()
+                    continue
+                if table_size:
+                    if table.get(child, depth + 2) <= depth + 1:
+                        if tracer is not None:
+                            tracer.duplicate()
+                        continue
+                    if child in table or len(table) < table_size:
+                        table[child] = depth + 1
+
+                depth += 1
+                states[depth] = child
+                blanks[depth] = target
+                next_move[depth] = 0
+                on_path.add(child)
+                nodes_expanded += 1
+                max_reached = max(max_reached, depth)
+                if tracer is not None:
+                    tracer.generated()
 
         end_time = time.time()
         return {
@@ -63,11 +385,18 @@ class Agent:
             "nodes_expanded": nodes_expanded,
             "moves": 0,
             "time": end_time - start_time,
+            "max_frontier": max_reached,
+            "visited_size": len(table),
         }
 
-    def solve_with_dfs(self, max_depth=20):
+    def solve_with_depth_limited_dfs(self, max_depth=20, tracer=None, visited=None):
         """
-        Resolve o problema usando o algoritmo DFS com limite de profundidade.
+        Resolve o problema usando o algoritmo DFS com limite de profundidade e conjunto de
+        visitados global (não garante a solução ótima).
+        - `tracer`: `SearchTracer` opcional, notificado a cada expansão (camada = profundidade).
+        - `visited`: conjunto de visitados vazio a ser usado no lugar do dicionário padrão,
+          como uma `PackedStateTable`, ou um `BloomFilter` (aproximado, sem pais), caso em
+          que o caminho é mantido junto com a pilha (ver `visited.py`).
         """
         if not self.board.check_is_solvable():
             return {
@@ -75,42 +404,70 @@ class Agent:
                 "nodes_expanded": 0,
                 "moves": 0,
                 "time": 0,
+                "max_frontier": 0,
+                "visited_size": 0,
+                "visited_bytes": 0,
             }
 
-        initial_state = self.board.board.flatten().tolist()
-        goal_state = list(range(1, self.board.rows * self.board.cols)) + [0]
+        initial_state, initial_blank = self.board.to_packed()
+        goal_state = self.board.goal_packed
 
-        stack = deque([(initial_state, [], 0)])  # Pilha para DFS: (estado, caminho, profundidade)
-        visited = set()
+        stack = deque([(initial_state, initial_blank, None, 0)])  # Pilha para DFS: (estado, posição do 0, pai, profundidade)
+        if visited is None:
+            visited = {}
+        approximate = getattr(visited, "approximate", False)
+        path = []  # Caminho até o estado atual, usado quando `visited` não guarda os pais
         nodes_expanded = 0
+        max_frontier = 1
 
         start_time = time.time()
 
         while stack:
-            current_state, path, depth = stack.pop()
-            state_tuple = tuple(current_state)
+            current_state, blank, parent, depth = stack.pop()
 
-            if state_tuple in visited:
+            if current_state in visited:
+                if tracer is not None:
+                    tracer.duplicate()
                 continue
-            visited.add(state_tuple)
+            if approximate:
+                visited.add(current_state)
+                # Na DFS, os ancestrais de um nó de profundidade d são os d últimos expandidos
+                del path[depth:]
+                path.append(current_state)
+            else:
+                visited[current_state] = parent
             nodes_expanded += 1
+            if tracer is not None:
+                tracer.expanded(depth, len(stack))
 
             if current_state == goal_state:
+                if approximate:
+                    solution = [self.board.unpack(step) for step in path]
+                else:
+                    solution = self.reconstruct_path(visited, current_state)
                 end_time = time.time()
                 return {
-                    "solution": path + [current_state],
+                    "solution": solution,
                     "nodes_expanded": nodes_expanded,
-                    "moves": len(path),
+                    "moves": len(solution) - 1,
                     "time": end_time - start_time,
+                    "max_frontier": max_frontier,
+                    "visited_size": len(visited),
+                    "visited_bytes": visited_nbytes(visited),
                 }
 
             if depth >= max_depth:
                 continue
 
-            neighbors = self.board.get_neighbors(current_state)
-            for neighbor in neighbors:
-                if tuple(neighbor) not in visited:
-                    stack.append((neighbor, path + [current_state], depth + 1))
+            neighbors = self.board.get_packed_neighbors(current_state, blank)
+            frontier_before = len(stack)
+            for neighbor, neighbor_blank in neighbors:
+                if neighbor not in visited:
+                    stack.append((neighbor, neighbor_blank, current_state, depth + 1))
+            max_frontier = max(max_frontier, len(stack))
+            if tracer is not None:
+                tracer.generated(len(stack) - frontier_before)
+                tracer.duplicate(len(neighbors) - (len(stack) - frontier_before))
 
         end_time = time.time()
         return {
@@ -118,11 +475,23 @@ class Agent:
             "nodes_expanded": nodes_expanded,
             "moves": 0,
             "time": end_time - start_time,
+            "max_frontier": max_frontier,
+            "visited_size": len(visited),
+            "visited_bytes": visited_nbytes(visited),
         }
 
-    def solve_with_a_star(self, max_moves=50):
+    def solve_with_a_star(self, max_moves=50, tie_break_on_h=False, heuristic=None, tracer=None):
         """
         Resolve o problema usando o algoritmo A* com limite de movimentos.
+        - `heuristic`: heurística incremental (ver `heuristics.py`), cujo h(n) dos filhos vem
+          de h(pai) + `delta`, ou função que recebe um estado codificado e retorna h(n),
+          como um `AdditivePatternDatabase`. Por padrão, usa `MisplacedTiles`.
+        - `tracer`: `SearchTracer` opcional, notificado a cada expansão (camada = f(n)) e
+          com o tempo gasto na heurística.
+        - A fronteira é um heap binário ordenado por (f(n), desempate, ordem de inserção).
+        - Com `tie_break_on_h` True, empates em f(n) favorecem o menor h(n); caso
+          contrário, vale a ordem de inserção (FIFO).
+        - Entradas obsoletas são descartadas apenas quando retiradas do heap.
         """
         if not self.board.check_is_solvable():
             return {
@@ -131,54 +500,96 @@ class Agent:
                 "moves": 0,
                 "time": 0,
                 "limit_reached": False,
+                "max_frontier": 0,
+                "visited_size": 0,
             }
 
-        initial_state = self.board.board.flatten().tolist()
-        goal_state = list(range(1, self.board.rows * self.board.cols)) + [0]
-
-        priority_queue = deque([(0, 0, initial_state, [])])  # (f(n), g(n), estado, caminho)
-        visited = set()
+        initial_state, initial_blank = self.board.to_packed()
+        goal_state = self.board.goal_packed
+        bits, tile_mask = self.board.bits, self.board.tile_mask
+        if heuristic is None:
+            heuristic = MisplacedTiles(self.board.rows, self.board.cols)
+        incremental = hasattr(heuristic, "delta")
+
+        counter = 0  # Ordem de inserção, garante desempate estável no heap
+        # (f(n), desempate, ordem, g(n), estado, posição do 0, pai)
+        h = heuristic.initial(initial_state) if incremental else heuristic(initial_state)
+        priority_queue = [(h, h if tie_break_on_h else 0, counter, 0, initial_state, initial_blank, None)]
+        best_g = {initial_state: 0}  # Menor g(n) conhecido para cada estado
+        visited = {}
         nodes_expanded = 0
+        max_frontier = 1
 
         start_time = time.time()
 
         while priority_queue:
-            # Ordena a fila para simular uma fila de prioridade
-            priority_queue = deque(sorted(priority_queue, key=lambda x: x[0]))
-            _, g, current_state, path = priority_queue.popleft()
-            state_tuple = tuple(current_state)
+            f, _, _, g, current_state, blank, parent = heapq.heappop(priority_queue)
 
-            if state_tuple in visited:
+            if current_state in visited:
+                if tracer is not None:
+                    tracer.duplicate()
                 continue
-            visited.add(state_tuple)
+            visited[current_state] = parent
             nodes_expanded += 1
+            if tracer is not None:
+                tracer.expanded(f, len(priority_queue))
 
-            if len(path) > max_moves:
+            if g > max_moves:
                 end_time = time.time()
                 return {
                     "solution": None,
                     "nodes_expanded": nodes_expanded,
-                    "moves": len(path),
+                    "moves": g,
                     "time": end_time - start_time,
                     "limit_reached": True,
+                    "max_frontier": max_frontier,
+                    "visited_size": len(visited),
                 }
 
             if current_state == goal_state:
+                solution = self.reconstruct_path(visited, current_state)
                 end_time = time.time()
                 return {
-                    "solution": path + [current_state],
+                    "solution": solution,
                     "nodes_expanded": nodes_expanded,
-                    "moves": len(path),
+                    "moves": g,
                     "time": end_time - start_time,
                     "limit_reached": False,
+                    "max_frontier": max_frontier,
+                    "visited_size": len(visited),
                 }
 
-            for neighbors in self.board.get_neighbors(current_state):
-                if tuple(neighbors) not in visited:
-                    h = self.board.misplaced_tiles(np.array(neighbors), np.array(goal_state))
-                    g_new = self.board.cost(path + [current_state])
-                    f = g_new + h
-                    priority_queue.append((f, g_new, neighbors, path + [current_state]))
+            g_new = g + 1
+            h_parent = f - g
+            neighbors = self.board.get_packed_neighbors(current_state, blank)
+            frontier_before = len(priority_queue)
+            for neighbor, neighbor_blank in neighbors:
+                if neighbor in visited:
+                    continue
+                # Já existe uma entrada no heap com custo menor ou igual
+                if best_g.get(neighbor, g_new + 1) <= g_new:
+                    continue
+                best_g[neighbor] = g_new
+                if tracer is not None:
+                    heuristic_start = time.perf_counter()
+                if incremental:
+                    # A peça que estava em `neighbor_blank` foi para a antiga posição do 0
+                    tile = (current_state >> (bits * neighbor_blank)) & tile_mask
+                    h = h_parent + heuristic.delta(current_state, tile, neighbor_blank, blank)
+                else:
+                    h = heuristic(neighbor)
+                if tracer is not None:
+                    tracer.heuristic(time.perf_counter() - heuristic_start)
+                f = g_new + h
+                counter += 1
+                heapq.heappush(
+                    priority_queue,
+                    (f, h if tie_break_on_h else 0, counter, g_new, neighbor, neighbor_blank, current_state),
+                )
+            max_frontier = max(max_frontier, len(priority_queue))
+            if tracer is not None:
+                tracer.generated(len(priority_queue) - frontier_before)
+                tracer.duplicate(len(neighbors) - (len(priority_queue) - frontier_before))
 
         end_time = time.time()
         return {
@@ -187,4 +598,359 @@ class Agent:
             "moves": 0,
             "time": end_time - start_time,
             "limit_reached": False,
-        }
\ No newline at end of file
+            "max_frontier": max_frontier,
+            "visited_size": len(visited),
+        }
+
+    def solve_with_ida_star(self, max_nodes=None, time_limit=None, heuristic=None):
+        """
+        Resolve o problema usando o algoritmo IDA*.
+        - `heuristic`: heurística incremental (ver `heuristics.py`) ou função que recebe um
+          estado codificado e retorna h(n), como um `AdditivePatternDatabase`. Por padrão,
+          usa Manhattan + conflito linear.
+        - Usa memória O(profundidade): apenas o caminho atual é mantido.
+        - O movimento que desfaz o anterior nunca é gerado.
+        - `max_nodes` e `time_limit` (segundos) limitam a busca; ao estourar, retorna
+          `limit_reached` True.
+        """
+        if not self.board.check_is_solvable():
+            return {
+                "solution": None,
+                "nodes_expanded": 0,
+                "moves": 0,
+                "time": 0,
+                "limit_reached": False,
+                "max_frontier": 0,
+                "visited_size": 0,
+            }
+
+        move_table = self.board.move_table
+        bits, tile_mask = self.board.bits, self.board.tile_mask
+        if heuristic is None:
+            heuristic = ManhattanLinearConflict(self.board.rows, self.board.cols)
+        incremental = hasattr(heuristic, "delta")
+
+        initial_state, initial_blank = self.board.to_packed()
+        goal_state = self.board.goal_packed
+
+        found = -1  # Valores sentinela retornados pela busca em profundidade
+        aborted = -2
+        path = []  # Estados do caminho atual, sem o inicial
+        nodes_expanded = 0
+        max_depth = 0
+        deadline = None if time_limit is None else time.time() + time_limit
+
+        def search(state, blank, prev_blank, g, h, threshold):
+            nonlocal nodes_expanded, max_depth
+            f = g + h
+            if f > threshold:
+                return f
+            if state == goal_state:
+                return found
+
+            if max_nodes is not None and nodes_expanded >= max_nodes:
+                return aborted
+            if deadline is not None and nodes_expanded % 1024 == 0 and time.time() > deadline:
+                return aborted
+            nodes_expanded += 1
+            max_depth = max(max_depth, g)
+
+            minimum = float("inf")
+            for target in move_table[blank]:
+                if target == prev_blank:
+                    continue
+
+                # Move a peça de `target` para `blank`
+                shift = bits * target
+                tile = (state >> shift) & tile_mask
+                child = state - (tile << shift) + (tile << (bits * blank))
+                if incremental:
+                    h_new = h + heuristic.delta(state, tile, target, blank)
+                else:
+                    h_new = heuristic(child)
+
+                path.append(child)
+                result = search(child, target, blank, g + 1, h_new, threshold)
+                if result == found or result == aborted:
+                    return result
+                path.pop()
+                minimum = min(minimum, result)
+
+            return minimum
+
+        start_time = time.time()
+
+        h = heuristic.initial(initial_state) if incremental else heuristic(initial_state)
+        threshold = h
+        result = None
+        while True:
+            result = search(initial_state, initial_blank, None, 0, h, threshold)
+            if result in (found, aborted) or result == float("inf"):
+                break
+            threshold = result
+
+        end_time = time.time()
+
+        if result != found:
+            return {
+                "solution": None,
+                "nodes_expanded": nodes_expanded,
+                "moves": 0,
+                "time": end_time - start_time,
+                "limit_reached": result == aborted,
+                "max_frontier": max_depth,
+                "visited_size": 0,
+            }
+
+        return {
+            "solution": [self.board.unpack(state) for state in [initial_state] + path],
+            "nodes_expanded": nodes_expanded,
+            "moves": len(path),
+            "time": end_time - start_time,
+            "limit_reached": False,
+            "max_frontier": max_depth,
+            "visited_size": 0,
+        }
+
+    def solve_with_hda_star(self, workers=2, heuristic=None, batch_size=64, time_limit=None):
+        """
+        Resolve o problema com A* paralelo distribuído por hash (HDA*) em `workers`
+        processos (ver `parallel_astar.hda_star`).
+        - `heuristic`: como no IDA*; precisa ser serializável com `pickle`.
+        - `time_limit` (segundos) encerra a busca, retornando `limit_reached` True.
+        O relatório inclui, em "workers", as expansões, mensagens e estados enviados e o
+        tempo de comunicação de cada processo.
+        """
+        if not self.board.check_is_solvable():
+            return {
+                "solution": None,
+                "nodes_expanded": 0,
+                "moves": 0,
+                "time": 0,
+                "limit_reached": False,
+                "max_frontier": 0,
+                "visited_size": 0,
+                "workers": [],
+            }
+
+        initial_state, initial_blank = self.board.to_packed()
+        start_time = time.time()
+        path, stats, timed_out = hda_star(
+            initial_state, initial_blank, self.board.rows, self.board.cols,
+            workers=workers, heuristic=heuristic, batch_size=batch_size, time_limit=time_limit,
+        )
+        end_time = time.time()
+        return {
+            "solution": [self.board.unpack(state) for state in path] if path else None,
+            "nodes_expanded": sum(entry["expanded"] for entry in stats),
+            "moves": len(path) - 1 if path else 0,
+            "time": end_time - start_time,
+            "limit_reached": timed_out,
+            "max_frontier": sum(entry["max_open"] for entry in stats),
+            "visited_size": sum(entry["visited"] for entry in stats),
+            "workers": stats,
+        }
+
+    def solve_with_anytime_a_star(self, weights=(5, 3, 2, 1.5, 1), heuristic=None, time_limit=None, max_nodes=None):
+        """
+        A* ponderado anytime (no estilo do ARA*): gerador que ordena a fronteira por
+        f(n) = g(n) + w * h(n) e, a cada peso de `weights` (decrescentes), melhora a solução
+        anterior reaproveitando g(n), os pais e a fronteira já calculados.
+        - `heuristic`: heurística incremental ou função de estados codificados, como no A*.
+          Por padrão, usa Manhattan + conflito linear.
+        - `time_limit` (segundos) e `max_nodes` encerram a busca, mantendo a última solução.
+        Gera um relatório por peso concluído, com o custo ("moves"), o peso
+        usado ("weight") e o limite de subotimalidade ("bound"): custo <= bound * ótimo.
+        Com peso final 1 e sem estourar os limites, a última solução é ótima (bound 1).
+        Se nenhuma solução for encontrada, gera um único relatório com "solution" None e
+        "limit_reached" True quando a busca parou por `time_limit` ou `max_nodes`.
+        """
+        if not self.board.check_is_solvable():
+            yield {
+                "solution": None,
+                "nodes_expanded": 0,
+                "moves": 0,
+                "time": 0,
+                "limit_reached": False,
+                "weight": None,
+                "bound": None,
+                "visited_size": 0,
+            }
+            return
+
+        initial_state, initial_blank = self.board.to_packed()
+        goal_state = self.board.goal_packed
+        bits, tile_mask = self.board.bits, self.board.tile_mask
+        if heuristic is None:
+            heuristic = ManhattanLinearConflict(self.board.rows, self.board.cols)
+        incremental = hasattr(heuristic, "delta")
+
+        infinity = float("inf")
+        g_values = {initial_state: 0}
+        h_values = {initial_state: heuristic.initial(initial_state) if incremental else heuristic(initial_state)}
+        parents = {initial_state: None}
+        blanks = {initial_state: initial_blank}
+        # Estados abertos (na fronteira) e inconsistentes (melhorados depois de expandidos)
+        open_states = {initial_state}
+        inconsistent = set()
+        nodes_expanded = 0
+        counter = 0
+        deadline = None if time_limit is None else time.time() + time_limit
+        start_time = time.time()
+
+        for weight in weights:
+            # Reconstrói a fronteira com o novo peso, incluindo os estados inconsistentes
+            open_states |= inconsistent
+            inconsistent = set()
+            priority_queue = []
+            for state in open_states:
+                counter += 1
+                priority_queue.append((g_values[state] + weight * h_values[state], counter, g_values[state], state))
+            heapq.heapify(priority_queue)
+            closed = set()
+            aborted = False
+
+            while priority_queue and priority_queue[0][0] < g_values.get(goal_state, infinity):
+                _, _, g, current_state = heapq.heappop(priority_queue)
+                if current_state in closed or g != g_values[current_state]:
+                    continue
+                open_states.discard(current_state)
+                closed.add(current_state)
+                nodes_expanded += 1
+
+                blank = blanks[current_state]
+                h_parent = h_values[current_state]
+                g_new = g + 1
+                for neighbor, neighbor_blank in self.board.get_packed_neighbors(current_state, blank):
+                    if g_values.get(neighbor, infinity) <= g_new:
+                        continue
+                    g_values[neighbor] = g_new
+                    parents[neighbor] = current_state
+                    blanks[neighbor] = neighbor_blank
+                    if neighbor not in h_values:
+                        if incremental:
+                            tile = (current_state >> (bits * neighbor_blank)) & tile_mask
+                            h_values[neighbor] = h_parent + heuristic.delta(current_state, tile, neighbor_blank, blank)
+                        else:
+                            h_values[neighbor] = heuristic(neighbor)
+                    if neighbor in closed:
+                        inconsistent.add(neighbor)
+                    else:
+                        open_states.add(neighbor)
+                        counter += 1
+                        heapq.heappush(
+                            priority_queue,
+                            (g_new + weight * h_values[neighbor], counter, g_new, neighbor),
+                        )
+
+                if (max_nodes is not None and nodes_expanded >= max_nodes) or (
+                    deadline is not None and nodes_expanded % 1024 == 0 and time.time() >= deadline
+                ):
+                    aborted = True
+                    break
+
+            if goal_state not in g_values:
+                # Nenhuma solução até aqui: informa se foi por causa dos limites
+                yield {
+                    "solution": None,
+                    "nodes_expanded": nodes_expanded,
+                    "moves": 0,
+                    "time": time.time() - start_time,
+                    "limit_reached": aborted,
+                    "weight": weight,
+                    "bound": None,
+                    "visited_size": len(g_values),
+                }
+                return
+            if aborted:
+                return
+            # Os pais podem já formar um caminho mais curto que g(objetivo), quando
+            # ancestrais foram melhorados depois de o objetivo ser alcançado
+            solution = self.reconstruct_path(parents, goal_state)
+            cost = len(solution) - 1
+
+            # Nenhum estado aberto ou inconsistente tem g + h menor que o ótimo
+            lower_bound = min(
+                (g_values[state] + h_values[state] for state in open_states | inconsistent),
+                default=cost,
+            )
+            bound = min(weight, cost / lower_bound) if lower_bound > 0 else 1.0
+            yield {
+                "solution": solution,
+                "nodes_expanded": nodes_expanded,
+                "moves": cost,
+                "time": time.time() - start_time,
+                "limit_reached": False,
+                "weight": weight,
+                "bound": max(1.0, bound),
+                "visited_size": len(g_values),
+            }
+            if bound <= 1:
+                return
+
+    # Métodos que sempre retornam caminhos ótimos, cujos estados podem ir para o cache
+    OPTIMAL_METHODS = (
+        "solve_with_bfs", "solve_with_bidirectional_bfs", "solve_with_vectorized_bfs", "solve_with_dfs",
+        "solve_with_a_star", "solve_with_ida_star", "solve_with_hda_star",
+    )
+
+    def cached_path(self, cache, state, blank):
+        """
+        Segue o cache (ver `SolutionCache`) a partir de `state` até o objetivo.
+        Retorna a lista de estados codificados, ou None se a cadeia estiver incompleta.
+        Os estados de um caminho completo são marcados como usados de uma só vez.
+        """
+        rows, cols = self.board.rows, self.board.cols
+        bits, tile_mask = self.board.bits, self.board.tile_mask
+        path = [state]
+        entry = cache.get(rows, cols, state)
+        while entry is not None:
+            distance, next_blank = entry
+            if distance == 0:
+                if state != self.board.goal_packed:
+                    return None
+                cache.touch(rows, cols, path)
+                return path
+            tile = (state >> (bits * next_blank)) & tile_mask
+            state = state - (tile << (bits * next_blank)) + (tile << (bits * blank))
+            blank = next_blank
+            path.append(state)
+            entry = cache.get(rows, cols, state)
+            if entry is not None and entry[0] != distance - 1:
+                return None
+        return None
+
+    def solve_with_cache(self, cache, method="solve_with_ida_star", **kwargs):
+        """
+        Consulta o cache de soluções antes de buscar e, após uma busca bem-sucedida,
+        registra todos os estados do caminho ótimo encontrado.
+        - `cache`: `SolutionCache` aberto pelo processo atual.
+        - `method`: nome de um dos `OPTIMAL_METHODS`, chamado com `kwargs` em caso de falha no cache.
+        O relatório ganha a chave "cache_hit".
+        """
+        if method not in self.OPTIMAL_METHODS:
+            raise ValueError(f"O cache só aceita métodos ótimos: {method}")
+
+        start_time = time.time()
+        initial_state, initial_blank = self.board.to_packed()
+        path = self.cached_path(cache, initial_state, initial_blank) if self.board.check_is_solvable() else None
+        if path is not None:
+            end_time = time.time()
+            return {
+                "solution": [self.board.unpack(state) for state in path],
+                "nodes_expanded": 0,
+                "moves": len(path) - 1,
+                "time": end_time - start_time,
+                "limit_reached": False,
+                "max_frontier": 0,
+                "visited_size": 0,
+                "cache_hit": True,
+            }
+
+        report = getattr(self, method)(**kwargs)
+        if report["solution"]:
+            steps = [self.board.to_packed(state) for state in report["solution"]]
+            if not cache.read_only:
+                cache.put_path(self.board.rows, self.board.cols, steps)
+        report["cache_hit"] = False
+        return report
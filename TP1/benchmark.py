@@ -0,0 +1,268 @@
+import contextlib
+import csv
+import json
+import multiprocessing as mp
+import resource
+import time
+import tracemalloc
+import numpy as np
+from tabulate import tabulate
+from agent import Agent
+from board import Board, generate_random_boards, generate_scrambled_boards
+from main import BATCH_METHODS
+
+# Conjuntos de instâncias padrão: (nome, lado do tabuleiro, gerador, métodos)
+# Os geradores usam sementes fixas, então o conjunto é sempre o mesmo.
+DEFAULT_SUITE = [
+    ("8-puzzle", 3, lambda count: generate_random_boards(count, 3, 3, seed=0), list(BATCH_METHODS)),
+    ("15-puzzle-10", 4, lambda count: generate_scrambled_boards(count, 10, seed=10), list(BATCH_METHODS)),
+    ("15-puzzle-20", 4, lambda count: generate_scrambled_boards(count, 20, seed=20), ["A*", "IDA*", "BFS", "BFS Bidirecional", "BFS Vetorizado"]),
+    ("15-puzzle-30", 4, lambda count: generate_scrambled_boards(count, 30, seed=30), ["A*", "IDA*", "BFS Bidirecional"]),
+]
+
+RECORD_FIELDS = [
+    "group", "instance", "method", "status", "moves", "nodes_expanded",
+    "wall_time", "nodes_per_second", "peak_rss_kb", "tracemalloc_peak_kb",
+]
+
+
+def load_korf100(path):
+    """
+    Lê as 100 instâncias de Korf (1985), uma por linha com 16 números, opcionalmente
+    precedidos pelo número da instância e seguidos pela solução ótima.
+    As instâncias usam o objetivo com o 0 na primeira posição; elas são convertidas
+    para o objetivo deste projeto girando o tabuleiro 180° e trocando a peça t por 16 - t,
+    o que preserva as distâncias.
+    """
+    boards = []
+    with open(path) as f:
+        for line in f:
+            numbers = [int(value) for value in line.split()]
+            if len(numbers) < 16:
+                continue
+            tiles = numbers[1:17] if len(numbers) > 16 else numbers
+            boards.append([16 - tile if tile else 0 for tile in reversed(tiles)])
+    return np.array(boards, dtype=np.uint8)
+
+
+def measure_run(conn, state, size, method, trace_memory):
+    """
+    Executa uma única busca e envia as medições por `conn`. Roda em um processo próprio,
+    para que o pico de RSS seja o desta busca.
+    - Com `trace_memory`, mede apenas o pico do tracemalloc (que deixa a busca mais lenta).
+    """
+    board = Board(size, size)
+    board.init_board(initial_state=state)
+    name, kwargs = BATCH_METHODS[method]
+    agent = Agent(board)
+
+    if trace_memory:
+        tracemalloc.start()
+        getattr(agent, name)(**kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        conn.send({"tracemalloc_peak_kb": peak // 1024})
+        conn.close()
+        return
+
+    start = time.perf_counter()
+    report = getattr(agent, name)(**kwargs)
+    wall_time = time.perf_counter() - start
+    conn.send({
+        "status": "ok" if report["solution"] else "sem solução",
+        "moves": report["moves"] if report["solution"] else None,
+        "nodes_expanded": report["nodes_expanded"],
+        "wall_time": wall_time,
+        "nodes_per_second": report["nodes_expanded"] / wall_time if wall_time > 0 else None,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    })
+    conn.close()
+
+
+def run_isolated(state, size, method, trace_memory, timeout):
+    """
+    Roda `measure_run` em um processo novo, encerrando-o após `timeout` segundos.
+    Retorna o dicionário de medições, {"status": "falhou"} se o processo morrer sem
+    responder (exceção, falta de memória) ou None se o tempo acabar.
+    """
+    receiver, sender = mp.Pipe(duplex=False)
+    process = mp.Process(target=measure_run, args=(sender, state, size, method, trace_memory))
+    process.start()
+    sender.close()
+    result = None
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            result = {"status": "falhou"}
+    if result is None:
+        process.terminate()
+    process.join()
+    receiver.close()
+    return result
+
+
+def run_suite(suite, count, timeout, trace_memory=True, methods=None, csv_path=None):
+    """
+    Executa todos os métodos sobre todas as instâncias de cada grupo da suíte.
+    Retorna a lista de registros (um por execução).
+    - `csv_path`: arquivo CSV em que cada registro é gravado assim que a execução termina,
+      para que um benchmark interrompido não perca o que já foi medido.
+    """
+    records = []
+    with open(csv_path, "w", newline="") if csv_path else contextlib.nullcontext() as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=RECORD_FIELDS) if csv_file else None
+        if writer:
+            writer.writeheader()
+        for group, size, generator, group_methods in suite:
+            boards = generator(count)
+            for method in methods or group_methods:
+                for instance, board in enumerate(boards):
+                    state = board.tolist()
+                    record = {"group": group, "instance": instance, "method": method}
+                    result = run_isolated(state, size, method, False, timeout)
+                    if result is None:
+                        record["status"] = "tempo esgotado"
+                    else:
+                        record.update(result)
+                        if trace_memory and record["status"] != "falhou":
+                            traced = run_isolated(state, size, method, True, timeout)
+                            record["tracemalloc_peak_kb"] = traced.get("tracemalloc_peak_kb") if traced else None
+                    records.append(record)
+                    if writer:
+                        writer.writerow({field: record.get(field) for field in RECORD_FIELDS})
+                        csv_file.flush()
+                    print(f"{group} #{instance} {method}: {record['status']}, {record.get('nodes_expanded')} nós")
+    return records
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else None
+
+
+def summarize(records):
+    """
+    Agrega os registros por (grupo, método): execuções resolvidas, nós expandidos,
+    nós por segundo, tempo (média e percentis 50/90/99) e picos de memória.
+    """
+    summary = []
+    keys = list(dict.fromkeys((record["group"], record["method"]) for record in records))
+    for group, method in keys:
+        runs = [r for r in records if r["group"] == group and r["method"] == method]
+        solved = [r for r in runs if r.get("status") == "ok"]
+        times = [r["wall_time"] for r in solved]
+        nodes = sum(r["nodes_expanded"] for r in solved)
+        rss = [r["peak_rss_kb"] for r in solved]
+        traced = [r["tracemalloc_peak_kb"] for r in solved if r.get("tracemalloc_peak_kb") is not None]
+        summary.append({
+            "group": group,
+            "method": method,
+            "runs": len(runs),
+            "solved": len(solved),
+            "nodes_expanded": nodes,
+            "nodes_per_second": nodes / sum(times) if times and sum(times) > 0 else None,
+            "time_mean": float(np.mean(times)) if times else None,
+            "time_p50": percentile(times, 50),
+            "time_p90": percentile(times, 90),
+            "time_p99": percentile(times, 99),
+            "peak_rss_kb_max": max(rss) if rss else None,
+            "tracemalloc_peak_kb_max": max(traced) if traced else None,
+        })
+    return summary
+
+
+def baseline_warnings(baseline, count, timeout, summary):
+    """
+    Diferenças entre a execução atual e a de referência que tornam a comparação
+    enganosa: outro número de instâncias, outro tempo limite ou outro número de
+    execuções resolvidas em algum (grupo, método).
+    """
+    warnings = []
+    if baseline.get("count") != count:
+        warnings.append(f"a referência usou --count {baseline.get('count')}, esta execução usou {count}")
+    if baseline.get("timeout") != timeout:
+        warnings.append(f"a referência usou --timeout {baseline.get('timeout')}, esta execução usou {timeout}")
+    previous = {(row["group"], row["method"]): row for row in baseline["summary"]}
+    for row in summary:
+        old = previous.get((row["group"], row["method"]))
+        if old and (old["runs"], old["solved"]) != (row["runs"], row["solved"]):
+            warnings.append(
+                f"{row['group']} {row['method']}: {row['solved']}/{row['runs']} resolvidos, "
+                f"{old['solved']}/{old['runs']} na referência"
+            )
+    return warnings
+
+
+def compare_with_baseline(records, baseline):
+    """
+    Compara as execuções atuais com as de uma execução anterior (mesmo formato JSON).
+    Só entram as execuções (grupo, instância, método) resolvidas nas duas; retorna, por
+    (grupo, método), o número dessas execuções e a variação relativa da soma dos nós
+    expandidos, do tempo mediano e do maior pico de RSS entre elas.
+    """
+    previous = {
+        (record["group"], record["instance"], record["method"]): record
+        for record in baseline["records"] if record.get("status") == "ok"
+    }
+    pairs = {}
+    for record in records:
+        old = previous.get((record["group"], record["instance"], record["method"]))
+        if old and record.get("status") == "ok":
+            pairs.setdefault((record["group"], record["method"]), []).append((old, record))
+
+    def change(old_value, new_value):
+        if not old_value or new_value is None:
+            return "N/A"
+        return f"{100 * (new_value - old_value) / old_value:+.1f}%"
+
+    rows = []
+    for (group, method), matched in pairs.items():
+        old_runs, new_runs = zip(*matched)
+        rows.append([
+            group, method, len(matched),
+            change(sum(r["nodes_expanded"] for r in old_runs), sum(r["nodes_expanded"] for r in new_runs)),
+            change(percentile([r["wall_time"] for r in old_runs], 50), percentile([r["wall_time"] for r in new_runs], 50)),
+            change(max(r["peak_rss_kb"] for r in old_runs), max(r["peak_rss_kb"] for r in new_runs)),
+        ])
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark reprodutível dos algoritmos de busca")
+    parser.add_argument("--count", type=int, default=10, help="Instâncias por grupo (padrão: 10)")
+    parser.add_argument("--timeout", type=float, default=60, help="Tempo máximo por execução, em segundos (padrão: 60)")
+    parser.add_argument("--methods", nargs="+", choices=list(BATCH_METHODS), help="Métodos avaliados (padrão: os de cada grupo)")
+    parser.add_argument("--korf", type=str, help="Arquivo com as 100 instâncias de Korf, resolvidas com IDA*")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Não mede o pico do tracemalloc (evita uma segunda execução)")
+    parser.add_argument("--json", type=str, default="benchmark.json", help="Arquivo JSON de saída (padrão: benchmark.json)")
+    parser.add_argument("--csv", type=str, default="benchmark.csv", help="Arquivo CSV de saída (padrão: benchmark.csv)")
+    parser.add_argument("--baseline", type=str, help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args()
+
+    suite = list(DEFAULT_SUITE)
+    if args.korf:
+        korf_boards = load_korf100(args.korf)
+        suite.append(("korf100", 4, lambda count: korf_boards[:count], ["IDA*"]))
+
+    records = run_suite(suite, args.count, args.timeout, trace_memory=not args.no_tracemalloc, methods=args.methods, csv_path=args.csv)
+    summary = summarize(records)
+
+    with open(args.json, "w") as f:
+        json.dump({"count": args.count, "timeout": args.timeout, "records": records, "summary": summary}, f, indent=2)
+
+    headers = ["Grupo", "Método", "Resolvidos", "Nós Expandidos", "Nós/s", "Tempo p50", "Tempo p90", "Tempo p99", "RSS Máx. (KB)", "tracemalloc Máx. (KB)"]
+    print(tabulate([
+        [row["group"], row["method"], f"{row['solved']}/{row['runs']}", row["nodes_expanded"], row["nodes_per_second"],
+         row["time_p50"], row["time_p90"], row["time_p99"], row["peak_rss_kb_max"], row["tracemalloc_peak_kb_max"]]
+        for row in summary
+    ], headers=headers, tablefmt="grid", floatfmt=".4f"))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print("\nComparação com a execução de referência (execuções resolvidas nas duas):")
+        for warning in baseline_warnings(baseline, args.count, args.timeout, summary):
+            print(f"Atenção: {warning}")
+        print(tabulate(compare_with_baseline(records, baseline), headers=["Grupo", "Método", "Execuções", "Nós Expandidos", "Tempo p50", "RSS Máx."], tablefmt="grid"))
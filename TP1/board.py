@@ -1,21 +1,307 @@
 import numpy as np
 from collections import deque
-import copy
+from functools import lru_cache
 
 ROWS = 4
 COLS = 4
 
+# Codificação compacta: cada peça ocupa `bits_per_tile(n)` bits (4 no 15-puzzle) e a
+# posição i fica nos bits [b * i, b * i + b)
+BITS_PER_TILE = 4
+TILE_MASK = (1 << BITS_PER_TILE) - 1
+
+
+def bits_per_tile(size):
+    """
+    Número de bits necessários para representar as peças 0..size-1.
+    """
+    return max(1, (size - 1).bit_length())
+
+
+def pack_state(state, bits=BITS_PER_TILE):
+    """
+    Codifica um estado (lista, tupla ou array) em um único inteiro (64 bits no 15-puzzle).
+    """
+    packed = 0
+    for i, tile in enumerate(np.asarray(state).flatten().tolist()):
+        packed |= tile << (bits * i)
+    return packed
+
+
+def unpack_state(packed, size=ROWS * COLS, bits=BITS_PER_TILE):
+    """
+    Decodifica um inteiro gerado por `pack_state` de volta para uma lista.
+    """
+    mask = (1 << bits) - 1
+    return [(packed >> (bits * i)) & mask for i in range(size)]
+
+
+def count_inversions(values):
+    """
+    Conta os pares (i, j) com i < j e values[i] > values[j] em O(n log n), via merge sort.
+    """
+    values = list(values)
+    inversions = 0
+    width = 1
+    while width < len(values):
+        merged = []
+        for start in range(0, len(values), 2 * width):
+            left = values[start:start + width]
+            right = values[start + width:start + 2 * width]
+            i = j = 0
+            while i < len(left) and j < len(right):
+                if left[i] <= right[j]:
+                    merged.append(left[i])
+                    i += 1
+                else:
+                    # Todos os elementos restantes da esquerda são maiores que right[j]
+                    merged.append(right[j])
+                    inversions += len(left) - i
+                    j += 1
+            merged.extend(left[i:])
+            merged.extend(right[j:])
+        values = merged
+        width *= 2
+    return inversions
+
+
+@lru_cache(maxsize=None)
+def board_tables(rows, cols):
+    """
+    Pré-calcula, uma vez por tamanho de tabuleiro, as estruturas compartilhadas pelos Boards:
+    (bits por peça, estado objetivo, objetivo codificado, tabela de movimentos, máscara
+    com o bit menos significativo de cada peça exceto o da posição final do 0).
+    - A tabela de movimentos lista, para cada posição do 0, as posições para onde ele
+      pode se mover (na ordem cima, baixo, esquerda, direita).
+    """
+    size = rows * cols
+    bits = bits_per_tile(size)
+    goal_state = tuple(range(1, size)) + (0,)
+
+    move_table = []
+    for pos in range(size):
+        row, col = divmod(pos, cols)
+        targets = []
+        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            r, c = row + dr, col + dc
+            if 0 <= r < rows and 0 <= c < cols:
+                targets.append(r * cols + c)
+        move_table.append(tuple(targets))
+
+    low_bits = sum(1 << (bits * i) for i in range(size - 1))
+    return bits, goal_state, pack_state(goal_state, bits), tuple(move_table), low_bits
+
+
+def is_solvable_batch(boards, rows=ROWS, cols=COLS, chunk_size=4096):
+    """
+    Versão vetorizada de `Board.check_is_solvable` para um array (n, rows * cols).
+    Um estado é solucionável quando a paridade da permutação (com o 0 tratado como a
+    maior peça) é igual à paridade da distância de Manhattan do 0 até o canto final.
+    """
+    boards = np.asarray(boards).reshape(-1, rows * cols)
+    size = rows * cols
+    upper = np.triu(np.ones((size, size), dtype=bool), k=1)
+    values = np.where(boards == 0, size, boards)
+
+    parity = np.empty(len(boards), dtype=np.int64)
+    for start in range(0, len(boards), chunk_size):
+        block = values[start:start + chunk_size]
+        # inversões: pares i < j com block[:, i] > block[:, j]
+        greater = (block[:, :, None] > block[:, None, :]) & upper
+        parity[start:start + chunk_size] = greater.sum(axis=(1, 2)) % 2
+
+    blank = np.argmax(boards == 0, axis=1)
+    blank_distance = (rows - 1 - blank // cols) + (cols - 1 - blank % cols)
+    return parity == blank_distance % 2
+
+
+def _unique_non_goal(boards, goal):
+    """
+    Remove tabuleiros repetidos e o objetivo, preservando a ordem de geração.
+    """
+    boards = boards[~np.all(boards == goal, axis=1)]
+    _, first = np.unique(boards, axis=0, return_index=True)
+    return boards[np.sort(first)]
+
+
+def generate_random_boards(count, rows=ROWS, cols=COLS, seed=None, path=None):
+    """
+    Gera `count` tabuleiros aleatórios, únicos, solucionáveis e diferentes do objetivo,
+    retornando um array (count, rows * cols) de uint8.
+    - Permutações sem solução são corrigidas trocando as duas primeiras peças não nulas,
+      o que mantém a distribuição uniforme sobre os estados solucionáveis.
+    - `seed`: semente (ou `np.random.Generator`) para gerar o mesmo conjunto novamente.
+    - `path`: se fornecido, grava o conjunto com `save_boards`.
+    """
+    rng = np.random.default_rng(seed)
+    size = rows * cols
+    goal = np.array(board_tables(rows, cols)[1], dtype=np.uint8)
+    boards = np.empty((0, size), dtype=np.uint8)
+
+    while len(boards) < count:
+        missing = count - len(boards)
+        batch = rng.permuted(np.tile(np.arange(size, dtype=np.uint8), (missing, 1)), axis=1)
+
+        unsolvable = np.flatnonzero(~is_solvable_batch(batch, rows, cols))
+        if len(unsolvable):
+            # Posições das duas primeiras peças não nulas de cada tabuleiro sem solução
+            nonzero = np.argsort(batch[unsolvable] == 0, axis=1, kind="stable")[:, :2]
+            first, second = nonzero[:, 0], nonzero[:, 1]
+            tiles = batch[unsolvable, first].copy()
+            batch[unsolvable, first] = batch[unsolvable, second]
+            batch[unsolvable, second] = tiles
+
+        boards = _unique_non_goal(np.concatenate([boards, batch]), goal)
+
+    boards = boards[:count]
+    if path:
+        save_boards(path, boards)
+    return boards
+
+
+def generate_scrambled_boards(count, num_moves, rows=ROWS, cols=COLS, seed=None, unique=True, path=None):
+    """
+    Gera `count` tabuleiros embaralhando o objetivo com `num_moves` movimentos aleatórios,
+    sem desfazer imediatamente o movimento anterior. Todos os tabuleiros avançam juntos,
+    com indexação vetorizada, e são sempre solucionáveis.
+    - Com `unique` True, descarta repetidos e o próprio objetivo, gerando mais até
+      completar `count` (números pequenos de movimentos podem não ter tabuleiros suficientes).
+    - `seed` e `path` como em `generate_random_boards`.
+    """
+    rng = np.random.default_rng(seed)
+    size = rows * cols
+    _, goal_state, _, move_table, _ = board_tables(rows, cols)
+    goal = np.array(goal_state, dtype=np.uint8)
+
+    # Tabela de movimentos preenchida com -1 onde não há vizinho
+    moves = np.full((size, 4), -1, dtype=np.int64)
+    for pos, targets in enumerate(move_table):
+        moves[pos, :len(targets)] = targets
+
+    boards = np.empty((0, size), dtype=np.uint8)
+    attempts_without_new = 0
+    while len(boards) < count:
+        missing = count - len(boards)
+        batch = np.tile(goal, (missing, 1))
+        rows_index = np.arange(missing)
+        blank = np.full(missing, size - 1, dtype=np.int64)
+        previous = np.full(missing, -1, dtype=np.int64)
+
+        for _ in range(num_moves):
+            candidates = moves[blank]
+            valid = (candidates >= 0) & (candidates != previous[:, None])
+            # O maior valor aleatório entre os movimentos válidos escolhe um deles uniformemente
+            choice = np.argmax(rng.random(candidates.shape) * valid, axis=1)
+            target = candidates[rows_index, choice]
+            batch[rows_index, blank] = batch[rows_index, target]
+            batch[rows_index, target] = 0
+            previous, blank = blank, target
+
+        if not unique:
+            boards = np.concatenate([boards, batch])
+            break
+        before = len(boards)
+        boards = _unique_non_goal(np.concatenate([boards, batch]), goal)
+        attempts_without_new = attempts_without_new + 1 if len(boards) == before else 0
+        if attempts_without_new >= 20:
+            raise ValueError("Não há tabuleiros distintos suficientes para esse número de movimentos.")
+
+    boards = boards[:count]
+    if path:
+        save_boards(path, boards)
+    return boards
+
+
+def save_boards(path, boards):
+    """
+    Grava um conjunto de tabuleiros (n, rows * cols) em formato `.npy`.
+    """
+    np.save(path, np.asarray(boards, dtype=np.uint8))
+
+
+def load_boards(path, mmap_mode=None):
+    """
+    Carrega um conjunto gravado por `save_boards`.
+    """
+    return np.load(path, mmap_mode=mmap_mode)
+
+
+def packed_dtype(rows=ROWS, cols=COLS):
+    """
+    Tipo dos arrays de estados codificados: `uint64` quando cabem em 64 bits (até 4x4),
+    ou inteiros Python (`object`) para tabuleiros maiores.
+    """
+    size = rows * cols
+    return np.uint64 if bits_per_tile(size) * size <= 64 else object
+
+
+def blank_positions(states, rows=ROWS, cols=COLS):
+    """
+    Posição do 0 em cada estado de um array de estados codificados.
+    """
+    size = rows * cols
+    bits = bits_per_tile(size)
+    dtype = packed_dtype(rows, cols)
+    mask = np.array((1 << bits) - 1, dtype=dtype)
+    blanks = np.zeros(len(states), dtype=np.int64)
+    for pos in range(size):
+        blanks[(states >> np.array(bits * pos, dtype=dtype)) & mask == 0] = pos
+    return blanks
+
+
+def sorted_contains(sorted_states, values):
+    """
+    Indica, por busca binária, quais `values` estão no array ordenado `sorted_states`
+    (que pode ser um `np.memmap`, lido só nas páginas visitadas pela busca).
+    """
+    if not len(sorted_states):
+        return np.zeros(len(values), dtype=bool)
+    index = np.searchsorted(sorted_states, values)
+    index[index == len(sorted_states)] = 0
+    return sorted_states[index] == values
+
+
+def expand_packed(states, blanks, rows=ROWS, cols=COLS):
+    """
+    Gera, de forma vetorizada, os filhos de um array de estados codificados, um
+    movimento do 0 por vez (cima, baixo, esquerda, direita).
+    Retorna (filhos, posições do 0 nos filhos, índice do pai de cada filho).
+    """
+    size = rows * cols
+    bits, _, _, move_table, _ = board_tables(rows, cols)
+    dtype = packed_dtype(rows, cols)
+    moves = np.full((size, 4), -1, dtype=np.int64)
+    for pos, targets in enumerate(move_table):
+        moves[pos, :len(targets)] = targets
+    tile_mask = np.array((1 << bits) - 1, dtype=dtype)
+
+    children, child_blanks, parents = [], [], []
+    for d in range(4):
+        targets = moves[blanks, d]
+        parent = np.flatnonzero(targets >= 0)
+        state, blank, target = states[parent], blanks[parent], targets[parent]
+        shift = (bits * target).astype(dtype)
+        tile = (state >> shift) & tile_mask
+        children.append(state - (tile << shift) + (tile << (bits * blank).astype(dtype)))
+        child_blanks.append(target)
+        parents.append(parent)
+    return np.concatenate(children), np.concatenate(child_blanks), np.concatenate(parents)
+
 
 class Board:
     """
-    Cria o tabuleiro para o jogo.
+    Cria o tabuleiro para o jogo (rows x cols, 4x4 por padrão).
     """
 
-    def __init__(self):
-        self.rows = ROWS
-        self.cols = COLS
+    def __init__(self, rows=ROWS, cols=COLS):
+        self.rows = rows
+        self.cols = cols
         self.board = np.zeros(shape=(self.rows, self.cols), dtype=int)
 
+        # Estado objetivo (em lista e codificado) e tabela de movimentos por posição do 0
+        self.bits, self.goal_state, self.goal_packed, self.move_table, self._low_bits = board_tables(rows, cols)
+        self.tile_mask = (1 << self.bits) - 1
+
     def init_board(self, initial_state=None, simple=False, num_moves=10):
         """
         Inicializa o tabuleiro.
@@ -23,7 +309,7 @@ class Board:
         - Se `simple` for True, gera um tabuleiro simples com poucos movimentos.
         - Caso contrário, gera um tabuleiro aleatório.
         """
-        goal_state = list(range(1, self.rows * self.cols)) + [0]
+        goal_state = list(self.goal_state)
 
         if initial_state:
             # Usa o estado inicial fornecido
@@ -49,17 +335,12 @@ class Board:
         """
         Checa se a configuração atual do tabuleiro possui solução.
         """
-        inversions = 0
-        flat_board = self.board.flatten()
+        flat_board = self.board.flatten().tolist()
+        inversions = count_inversions(tile for tile in flat_board if tile != 0)
 
-        for i in range(len(flat_board)):
-            for j in range(i + 1, len(flat_board)):
-                if (
-                    flat_board[i] != 0
-                    and flat_board[j] != 0
-                    and flat_board[i] > flat_board[j]
-                ):
-                    inversions += 1
+        # Com largura ímpar, cada movimento preserva a paridade das inversões
+        if self.cols % 2 != 0:
+            return inversions % 2 == 0
 
         blank_tile_row, _ = np.where(self.board == 0)
 
@@ -77,26 +358,41 @@ class Board:
         """
         Gera todos os estados vizinhos possíveis ao mover o 0.
         """
+        packed = pack_state(state, self.bits)
+        blank = self.unpack(packed).index(0)
+        return [self.unpack(neighbor) for neighbor, _ in self.get_packed_neighbors(packed, blank)]
+
+    def get_packed_neighbors(self, packed, blank):
+        """
+        Gera os vizinhos de um estado codificado, retornando pares (estado, posição do 0).
+        Como a posição do 0 vale zero, basta mover a peça vizinha para o lugar dele.
+        """
         neighbors = []
-        rows, cols = self.rows, self.cols
-        state = np.array(state).reshape((rows, cols))
-        row, col = np.where(state == 0)
-        row, col = row[0], col[0]
+        for target in self.move_table[blank]:
+            shift = self.bits * target
+            tile = (packed >> shift) & self.tile_mask
+            neighbors.append((packed - (tile << shift) + (tile << (self.bits * blank)), target))
+        return neighbors
+
+    def to_packed(self, state=None):
+        """
+        Codifica o estado (por padrão, o tabuleiro atual) e retorna (estado, posição do 0).
+        """
+        flat = (self.board if state is None else np.asarray(state)).flatten().tolist()
+        return pack_state(flat, self.bits), flat.index(0)
 
-        moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # cima, baixo, esquerda, direita
+    def unpack(self, packed):
+        """
+        Converte um estado codificado de volta para lista.
+        """
+        return unpack_state(packed, self.rows * self.cols, self.bits)
 
-        for dr, dc in moves:
-            r, c = row + dr, col + dc
-            if 0 <= r < rows and 0 <= c < cols:
-                new_state = copy.deepcopy(state)
-                new_state[row, col], new_state[r, c] = (
-                    new_state[r, c],
-                    new_state[row, col],
-                )
-                neighbors.append(new_state.flatten().tolist())
+    def to_matrix(self, packed):
+        """
+        Converte um estado codificado para a forma matricial usada em `self.board`.
+        """
+        return np.array(self.unpack(packed)).reshape(self.rows, self.cols)
 
-        return neighbors
-    
     def cost(self, path):
         """
         Calcula o custo acumulado (g(n)) com base no número de movimentos realizados.
@@ -109,19 +405,15 @@ class Board:
         a partir do estado objetivo.
         - `num_moves`: Número de movimentos aleatórios para embaralhar o tabuleiro.
         """
-        # Começa com o estado objetivo
-        goal_state = list(range(1, self.rows * self.cols)) + [0]
-        self.board = np.array(goal_state).reshape(self.rows, self.cols)
+        # Começa com o estado objetivo; movimentos a partir dele sempre geram estados solucionáveis
+        packed, blank = self.goal_packed, self.rows * self.cols - 1
 
         # Aplica movimentos aleatórios
         for _ in range(num_moves):
-            neighbors = self.get_neighbors(self.board.flatten().tolist())
-            self.board = np.array(neighbors[np.random.choice(len(neighbors))]).reshape(self.rows, self.cols)
+            neighbors = self.get_packed_neighbors(packed, blank)
+            packed, blank = neighbors[np.random.choice(len(neighbors))]
 
-        # Verifica se o tabuleiro gerado é solucionável
-        if not self.check_is_solvable():
-            print("Tabuleiro gerado não é solucionável. Gerando novamente.")
-            self.generate_simple_board(num_moves=num_moves)
+        self.board = self.to_matrix(packed)
 
     def misplaced_tiles(self, state, goal_state):
         """
@@ -130,3 +422,16 @@ class Board:
         state = np.array(state).flatten()
         goal_state = np.array(goal_state).flatten()
         return np.sum((state != goal_state) & (goal_state != 0))
+
+    def misplaced_tiles_packed(self, packed):
+        """
+        Versão de `misplaced_tiles` para estados codificados: conta as peças
+        diferentes do objetivo, ignorando a posição final do 0.
+        """
+        diff = packed ^ self.goal_packed
+        # Acumula no bit menos significativo de cada peça se algum bit dela diferiu
+        folded = diff
+        for shift in range(1, self.bits):
+            folded |= diff >> shift
+        diff = folded & self._low_bits
+        return bin(diff).count("1")
@@ -0,0 +1,140 @@
+import glob
+import json
+import os
+import numpy as np
+from board import COLS, ROWS, blank_positions, board_tables, expand_packed, packed_dtype, sorted_contains
+
+
+def layer_path(directory, depth):
+    return os.path.join(directory, f"layer_{depth:03d}.bin")
+
+
+def read_layer(directory, depth):
+    """
+    Abre a camada `depth` gravada em disco como um `np.memmap` ordenado de `uint64`.
+    """
+    path = layer_path(directory, depth)
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=np.uint64)
+    return np.memmap(path, dtype=np.uint64, mode="r")
+
+
+def merge_runs(run_paths, out_path, exclude, block_size=1 << 16):
+    """
+    Intercala as sequências ordenadas gravadas em `run_paths`, lendo blocos de até
+    `block_size` estados de cada uma, e grava em `out_path` os estados sem repetição
+    que não estão em nenhum dos arrays ordenados de `exclude`.
+    Retorna o número de estados gravados.
+    """
+    runs = [np.memmap(path, dtype=np.uint64, mode="r") for path in run_paths if os.path.getsize(path)]
+    positions = [0] * len(runs)
+    count = 0
+    with open(out_path, "wb") as out:
+        while True:
+            active = [i for i in range(len(runs)) if positions[i] < len(runs[i])]
+            if not active:
+                break
+            blocks = [runs[i][positions[i]:positions[i] + block_size] for i in active]
+            # Tudo o que é <= ao menor dos últimos elementos já foi lido em todas as sequências
+            limit = min(block[-1] for block in blocks)
+            parts = []
+            for i, block in zip(active, blocks):
+                take = int(np.searchsorted(block, limit, side="right"))
+                parts.append(block[:take])
+                positions[i] += take
+            merged = np.unique(np.concatenate(parts))
+            for layer in exclude:
+                merged = merged[~sorted_contains(layer, merged)]
+            merged.tofile(out)
+            count += len(merged)
+    return count
+
+
+def _save_progress(directory, progress):
+    path = os.path.join(directory, "progress.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(progress, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def external_bfs(directory, initial_states, rows=ROWS, cols=COLS, max_depth=None, chunk_size=1 << 20, block_size=1 << 16):
+    """
+    BFS em memória externa: cada camada fica em disco (`directory`) como um arquivo de
+    estados codificados (`uint64`) ordenados, e só pedaços dela são lidos por vez.
+    - A camada d é expandida em pedaços de `chunk_size` estados; os filhos de cada pedaço
+      são ordenados e gravados como uma sequência, e as sequências são intercaladas por
+      `merge_runs`, descartando os estados das camadas d e d - 1 (consultadas via memmap).
+    - `progress.json` registra as camadas concluídas; chamar de novo com o mesmo diretório
+      e os mesmos estados iniciais retoma a busca de onde parou.
+    - Os estados iniciais podem ser abstratos (peças fora de um padrão trocadas por um
+      mesmo valor não nulo): a camada de cada estado abstrato é então a sua distância
+      até o objetivo do padrão, contando todos os movimentos, o que serve para construir
+      PDBs (não aditivos, combinados por máximo).
+    Gera (profundidade, camada) para cada camada, inclusive as já gravadas, até a camada
+    ficar vazia ou atingir `max_depth`, mesmo que o diretório tenha camadas mais profundas.
+    """
+    if packed_dtype(rows, cols) is not np.uint64:
+        raise ValueError("A BFS externa só aceita estados de até 64 bits (tabuleiros de até 4x4).")
+    os.makedirs(directory, exist_ok=True)
+    initial = np.unique(np.asarray(initial_states, dtype=np.uint64))
+    progress_path = os.path.join(directory, "progress.json")
+
+    if os.path.exists(progress_path):
+        with open(progress_path) as f:
+            progress = json.load(f)
+        if (progress["rows"], progress["cols"], progress["initial"]) != (rows, cols, initial.tolist()):
+            raise ValueError(f"O diretório {directory} contém outra busca.")
+    else:
+        initial.tofile(layer_path(directory, 0))
+        progress = {"rows": rows, "cols": cols, "initial": initial.tolist(), "sizes": [len(initial)]}
+        _save_progress(directory, progress)
+
+    sizes = progress["sizes"]
+    # Camadas de uma execução anterior mais profunda ficam no disco, mas não são geradas
+    stored = len(sizes) if max_depth is None else min(len(sizes), max_depth + 1)
+    for depth in range(stored):
+        yield depth, read_layer(directory, depth)
+
+    depth = len(sizes) - 1
+    while sizes[-1] and (max_depth is None or depth < max_depth):
+        current = read_layer(directory, depth)
+        previous = read_layer(directory, depth - 1) if depth else np.empty(0, dtype=np.uint64)
+
+        # Sequências de uma execução interrompida são descartadas
+        for stale in glob.glob(os.path.join(directory, f"run_{depth + 1:03d}_*.bin")):
+            os.remove(stale)
+        run_paths = []
+        for start in range(0, len(current), chunk_size):
+            states = np.asarray(current[start:start + chunk_size])
+            children, _, _ = expand_packed(states, blank_positions(states, rows, cols), rows, cols)
+            run_path = os.path.join(directory, f"run_{depth + 1:03d}_{len(run_paths):05d}.bin")
+            np.unique(children).tofile(run_path)
+            run_paths.append(run_path)
+
+        out_path = layer_path(directory, depth + 1)
+        count = merge_runs(run_paths, out_path + ".tmp", [current, previous], block_size)
+        os.replace(out_path + ".tmp", out_path)
+        for run_path in run_paths:
+            os.remove(run_path)
+
+        depth += 1
+        sizes.append(count)
+        _save_progress(directory, progress)
+        yield depth, read_layer(directory, depth)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="BFS em memória externa a partir do objetivo, com as camadas gravadas em disco")
+    parser.add_argument("--size", type=int, default=3, help="Lado do tabuleiro (padrão: 3)")
+    parser.add_argument("--out", default="bfs_layers", help="Diretório das camadas (padrão: bfs_layers)")
+    parser.add_argument("--max-depth", type=int, help="Profundidade máxima")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="Estados expandidos por vez (padrão: 1048576)")
+    args = parser.parse_args()
+
+    goal_packed = board_tables(args.size, args.size)[2]
+    total = 0
+    for depth, layer in external_bfs(args.out, [goal_packed], args.size, args.size, args.max_depth, args.chunk_size):
+        total += len(layer)
+        print(f"Profundidade {depth}: {len(layer)} estados (total: {total})")
@@ -0,0 +1,198 @@
+from functools import lru_cache
+from board import bits_per_tile, unpack_state
+
+
+@lru_cache(maxsize=None)
+def build_distance_tables(rows, cols):
+    """
+    Pré-calcula as tabelas usadas pelas heurísticas para um tabuleiro rows x cols.
+    Retorna (goal_row, goal_col, manhattan), onde `manhattan[tile][pos]` é a distância
+    de Manhattan da peça `tile` na posição `pos` até a sua posição no objetivo.
+    """
+    size = rows * cols
+    goal_row = [0] * size
+    goal_col = [0] * size
+    for tile in range(1, size):
+        goal_row[tile], goal_col[tile] = divmod(tile - 1, cols)
+
+    manhattan = [[0] * size for _ in range(size)]
+    for tile in range(1, size):
+        for pos in range(size):
+            row, col = divmod(pos, cols)
+            manhattan[tile][pos] = abs(row - goal_row[tile]) + abs(col - goal_col[tile])
+
+    return goal_row, goal_col, manhattan
+
+
+@lru_cache(maxsize=None)
+def line_conflicts(goal_indices):
+    """
+    Número mínimo de peças que precisam sair da linha (ou coluna) para que as demais
+    fiquem na ordem do objetivo.
+    - `goal_indices`: posições-objetivo, ao longo da linha, das peças que pertencem a ela,
+      na ordem em que aparecem no estado atual.
+    Equivale ao tamanho da linha menos a maior subsequência crescente.
+    """
+    longest = [1] * len(goal_indices)
+    for i in range(len(goal_indices)):
+        for j in range(i):
+            if goal_indices[j] < goal_indices[i]:
+                longest[i] = max(longest[i], longest[j] + 1)
+    return len(goal_indices) - max(longest, default=0)
+
+
+def row_conflicts(state, row, rows, cols):
+    """
+    Conflitos lineares da linha `row` de um estado em forma de lista.
+    """
+    goal_row, goal_col, _ = build_distance_tables(rows, cols)
+    line = state[row * cols:(row + 1) * cols]
+    return line_conflicts(tuple(goal_col[tile] for tile in line if tile and goal_row[tile] == row))
+
+
+def col_conflicts(state, col, rows, cols):
+    """
+    Conflitos lineares da coluna `col` de um estado em forma de lista.
+    """
+    goal_row, goal_col, _ = build_distance_tables(rows, cols)
+    line = state[col::cols]
+    return line_conflicts(tuple(goal_row[tile] for tile in line if tile and goal_col[tile] == col))
+
+
+def manhattan_distance(state, rows, cols):
+    """
+    Soma das distâncias de Manhattan de cada peça até a sua posição no objetivo.
+    """
+    _, _, manhattan = build_distance_tables(rows, cols)
+    return sum(manhattan[tile][pos] for pos, tile in enumerate(state) if tile)
+
+
+def linear_conflict(state, rows, cols):
+    """
+    Penalidade de conflito linear: cada peça que precisa sair da sua linha (ou coluna)
+    para dar passagem a outra custa dois movimentos extras.
+    """
+    conflicts = sum(row_conflicts(state, row, rows, cols) for row in range(rows))
+    conflicts += sum(col_conflicts(state, col, rows, cols) for col in range(cols))
+    return 2 * conflicts
+
+
+def manhattan_linear_conflict(state, rows, cols):
+    """
+    Heurística admissível: Manhattan + conflito linear.
+    """
+    return manhattan_distance(state, rows, cols) + linear_conflict(state, rows, cols)
+
+
+class MisplacedTiles:
+    """
+    Número de peças fora do lugar, com atualização incremental.
+    Todas as heurísticas incrementais recebem estados codificados (ver `Board.to_packed`):
+    - `initial(state)` calcula h do zero;
+    - `delta(state, moved_tile, from_pos, to_pos)` retorna a variação de h quando
+      `moved_tile` vai de `from_pos` para `to_pos` a partir de `state`.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        goal_row, goal_col, _ = build_distance_tables(rows, cols)
+        self.goal_pos = [goal_row[tile] * cols + goal_col[tile] for tile in range(rows * cols)]
+
+    def initial(self, state):
+        tiles = unpack_state(state, self.rows * self.cols, bits_per_tile(self.rows * self.cols))
+        return sum(1 for pos, tile in enumerate(tiles) if tile and self.goal_pos[tile] != pos)
+
+    def delta(self, state, moved_tile, from_pos, to_pos):
+        goal = self.goal_pos[moved_tile]
+        return (to_pos != goal) - (from_pos != goal)
+
+
+class Manhattan:
+    """
+    Distância de Manhattan com atualização incremental por consulta à tabela pré-calculada.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.table = build_distance_tables(rows, cols)[2]
+
+    def initial(self, state):
+        size = self.rows * self.cols
+        return manhattan_distance(unpack_state(state, size, bits_per_tile(size)), self.rows, self.cols)
+
+    def delta(self, state, moved_tile, from_pos, to_pos):
+        return self.table[moved_tile][to_pos] - self.table[moved_tile][from_pos]
+
+
+class LinearConflict:
+    """
+    Penalidade de conflito linear. Num movimento vertical, só a linha de destino ou a de
+    origem pode mudar, e apenas se for a linha-objetivo da peça movida (o mesmo vale
+    para colunas em movimentos horizontais).
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.goal_row, self.goal_col, _ = build_distance_tables(rows, cols)
+        self.bits = bits_per_tile(rows * cols)
+        self.tile_mask = (1 << self.bits) - 1
+        self.row_mask = (1 << (self.bits * cols)) - 1
+        # Conflitos já calculados, indexados pelos nibbles da linha/coluna
+        self._row_cache = [{} for _ in range(rows)]
+        self._col_cache = [{} for _ in range(cols)]
+
+    def initial(self, state):
+        return linear_conflict(unpack_state(state, self.rows * self.cols, self.bits), self.rows, self.cols)
+
+    def _row(self, state, row):
+        bits = (state >> (self.bits * self.cols * row)) & self.row_mask
+        cache = self._row_cache[row]
+        if bits not in cache:
+            line = [(bits >> (self.bits * i)) & self.tile_mask for i in range(self.cols)]
+            cache[bits] = line_conflicts(tuple(self.goal_col[tile] for tile in line if tile and self.goal_row[tile] == row))
+        return cache[bits]
+
+    def _col(self, state, col):
+        line = [(state >> (self.bits * (i * self.cols + col))) & self.tile_mask for i in range(self.rows)]
+        key = tuple(line)
+        cache = self._col_cache[col]
+        if key not in cache:
+            cache[key] = line_conflicts(tuple(self.goal_row[tile] for tile in line if tile and self.goal_col[tile] == col))
+        return cache[key]
+
+    def delta(self, state, moved_tile, from_pos, to_pos):
+        cols = self.cols
+        from_row, from_col = divmod(from_pos, cols)
+        to_row, to_col = divmod(to_pos, cols)
+        if from_row == to_row:
+            goal, line = self.goal_col[moved_tile], self._col
+            index = to_col if goal == to_col else from_col if goal == from_col else None
+        else:
+            goal, line = self.goal_row[moved_tile], self._row
+            index = to_row if goal == to_row else from_row if goal == from_row else None
+        if index is None:
+            return 0
+        child = state - (moved_tile << (self.bits * from_pos)) + (moved_tile << (self.bits * to_pos))
+        return 2 * (line(child, index) - line(state, index))
+
+
+class ManhattanLinearConflict:
+    """
+    Manhattan + conflito linear, com atualização incremental das duas parcelas.
+    """
+
+    def __init__(self, rows, cols):
+        self.manhattan = Manhattan(rows, cols)
+        self.linear_conflict = LinearConflict(rows, cols)
+
+    def initial(self, state):
+        return self.manhattan.initial(state) + self.linear_conflict.initial(state)
+
+    def delta(self, state, moved_tile, from_pos, to_pos):
+        return (
+            self.manhattan.delta(state, moved_tile, from_pos, to_pos)
+            + self.linear_conflict.delta(state, moved_tile, from_pos, to_pos)
+        )
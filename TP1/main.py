@@ -1,7 +1,25 @@
+import math
+import multiprocessing as mp
+import time
+import numpy as np
+from multiprocessing.connection import wait
 from board import Board
 from agent import Agent
 from tabulate import tabulate  # Biblioteca para formatar a saída como tabela
 
+# Métodos disponíveis no modo em lote: nome -> (método do Agent, argumentos)
+BATCH_METHODS = {
+    "A*": ("solve_with_a_star", {"max_moves": 100}),
+    "IDA*": ("solve_with_ida_star", {}),
+    "HDA*": ("solve_with_hda_star", {"workers": 2}),
+    "BFS": ("solve_with_bfs", {}),
+    "BFS Bidirecional": ("solve_with_bidirectional_bfs", {}),
+    "BFS Vetorizado": ("solve_with_vectorized_bfs", {}),
+    "DFS": ("solve_with_dfs", {}),
+    "DFS Limitada": ("solve_with_depth_limited_dfs", {}),
+}
+HEURISTIC_METHODS = ("A*", "IDA*", "HDA*")
+
 
 def initialize_board(use_random):
     """
@@ -29,99 +47,357 @@ def display_results(results):
     """
     Exibe os resultados em formato de tabela.
     """
-    headers = ["Método", "Nós Expandidos", "Movimentos", "Tempo"]
+    headers = ["Método", "Nós Expandidos", "Movimentos", "Tempo", "Fronteira Máx.", "Visitados", "Cache"]
     print("\nRelatório Final:")
     print(tabulate(results, headers=headers, tablefmt="grid"))
 
 
-def solve_and_collect_results(agent, max_moves=50):
+def cache_marker(report):
+    """
+    Coluna "Cache" do relatório: "sim" quando a solução veio do cache (a busca não rodou).
+    """
+    return "sim" if report.get("cache_hit") else "não"
+
+
+def solve_and_collect_results(agent, max_moves=50, ida_max_nodes=None, ida_time_limit=None, heuristic=None, hda_workers=None, cache=None):
     """
     Resolve o problema usando diferentes algoritmos e coleta os resultados.
+    - `ida_max_nodes` e `ida_time_limit` limitam a busca do IDA*.
+    - `heuristic`: heurística alternativa (por exemplo, PDBs) para o A*, o IDA* e o HDA*.
+    - `hda_workers`: se fornecido, também resolve com HDA* usando esse número de processos.
+    - `cache`: `SolutionCache` consultado antes de cada busca e preenchido com as soluções encontradas.
     """
     results = []
 
+    def solve(name, **kwargs):
+        if cache is not None:
+            return agent.solve_with_cache(cache, name, **kwargs)
+        return getattr(agent, name)(**kwargs)
+
     # Resolver com A*
     print("\nSolução usando A* encontrada")
-    a_star_report = agent.solve_with_a_star(max_moves=max_moves)
+    a_star_report = solve("solve_with_a_star", max_moves=max_moves, heuristic=heuristic)
     if a_star_report["solution"]:
         # print("Caminho da solução encontrado com A*:")
         # for step in a_star_report["solution"]:
         #     print(step)
         results.append([
-            "A*", a_star_report["nodes_expanded"], a_star_report["moves"], f"{a_star_report['time']:.4f} segundos"
+            "A*", a_star_report["nodes_expanded"], a_star_report["moves"], f"{a_star_report['time']:.4f} segundos",
+            a_star_report["max_frontier"], a_star_report["visited_size"], cache_marker(a_star_report)
         ])
     else:
         if a_star_report["limit_reached"]:
             print("O limite de movimentos foi atingido antes de encontrar a solução.")
         else:
             print("Nenhuma solução encontrada.")
-        results.append(["A*", "N/A", "N/A", "N/A"])
+        results.append(["A*", "N/A", "N/A", "N/A", "N/A", "N/A", "N/A"])
+
+    # Resolver com IDA*
+    print("\nSolução usando IDA* encontrada")
+    ida_star_report = solve("solve_with_ida_star", max_nodes=ida_max_nodes, time_limit=ida_time_limit, heuristic=heuristic)
+    if ida_star_report["solution"]:
+        results.append([
+            "IDA*", ida_star_report["nodes_expanded"], ida_star_report["moves"], f"{ida_star_report['time']:.4f} segundos",
+            ida_star_report["max_frontier"], ida_star_report["visited_size"], cache_marker(ida_star_report)
+        ])
+    else:
+        if ida_star_report["limit_reached"]:
+            print("O limite de nós ou de tempo do IDA* foi atingido antes de encontrar a solução.")
+        else:
+            print("Nenhuma solução encontrada com IDA*.")
+        results.append(["IDA*", "N/A", "N/A", "N/A", "N/A", "N/A", "N/A"])
+
+    # Resolver com HDA*
+    if hda_workers:
+        print(f"\nSolução usando HDA* com {hda_workers} processos encontrada")
+        hda_star_report = solve("solve_with_hda_star", workers=hda_workers, heuristic=heuristic)
+        if hda_star_report["solution"]:
+            results.append([
+                "HDA*", hda_star_report["nodes_expanded"], hda_star_report["moves"], f"{hda_star_report['time']:.4f} segundos",
+                hda_star_report["max_frontier"], hda_star_report["visited_size"], cache_marker(hda_star_report)
+            ])
+            for worker in hda_star_report["workers"]:
+                print(
+                    f"Processo {worker['worker']}: {worker['expanded']} nós expandidos, "
+                    f"{worker['messages_sent']} mensagens ({worker['states_sent']} estados) enviadas, "
+                    f"{worker['communication_time']:.4f} segundos em comunicação"
+                )
+        else:
+            print("Nenhuma solução encontrada com HDA*.")
+            results.append(["HDA*", "N/A", "N/A", "N/A", "N/A", "N/A", "N/A"])
 
     # Resolver com BFS
     print("\nSolução usando BFS encontrada")
-    bfs_report = agent.solve_with_bfs()
+    bfs_report = solve("solve_with_bfs")
     if bfs_report["solution"]:
         # print("Caminho da solução encontrado com BFS:")
         # for step in bfs_report["solution"]:
         #     print(step)
         results.append([
-            "BFS", bfs_report["nodes_expanded"], bfs_report["moves"], f"{bfs_report['time']:.4f} segundos"
+            "BFS", bfs_report["nodes_expanded"], bfs_report["moves"], f"{bfs_report['time']:.4f} segundos",
+            bfs_report["max_frontier"], bfs_report["visited_size"], cache_marker(bfs_report)
         ])
     else:
         print("Nenhuma solução encontrada com BFS.")
-        results.append(["BFS", "N/A", "N/A", "N/A"])
+        results.append(["BFS", "N/A", "N/A", "N/A", "N/A", "N/A", "N/A"])
+
+    # Resolver com BFS bidirecional
+    print("\nSolução usando BFS bidirecional encontrada")
+    bidirectional_report = solve("solve_with_bidirectional_bfs")
+    if bidirectional_report["solution"]:
+        results.append([
+            "BFS Bidirecional", bidirectional_report["nodes_expanded"], bidirectional_report["moves"],
+            f"{bidirectional_report['time']:.4f} segundos",
+            bidirectional_report["max_frontier"], bidirectional_report["visited_size"], cache_marker(bidirectional_report)
+        ])
+    else:
+        print("Nenhuma solução encontrada com BFS bidirecional.")
+        results.append(["BFS Bidirecional", "N/A", "N/A", "N/A", "N/A", "N/A", "N/A"])
 
     # Resolver com DFS
     print("\nSolução usando DFS encontrada")
-    dfs_report = agent.solve_with_dfs()
+    dfs_report = solve("solve_with_dfs")
     if dfs_report["solution"]:
         # print("Caminho da solução encontrado com DFS:")
         # for step in dfs_report["solution"]:
         #     print(step)
         results.append([
-            "DFS", dfs_report["nodes_expanded"], dfs_report["moves"], f"{dfs_report['time']:.4f} segundos"
+            "DFS", dfs_report["nodes_expanded"], dfs_report["moves"], f"{dfs_report['time']:.4f} segundos",
+            dfs_report["max_frontier"], dfs_report["visited_size"], cache_marker(dfs_report)
         ])
     else:
         print("Nenhuma solução encontrada com DFS.")
-        results.append(["DFS", "N/A", "N/A", "N/A"])
+        results.append(["DFS", "N/A", "N/A", "N/A", "N/A", "N/A", "N/A"])
 
     return results
 
 
+def fixed_test_state(size=4):
+    """
+    Tabuleiro fixo de testes: o objetivo com o 0 uma linha acima.
+    No 4x4: [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 0, 13, 14, 15, 12].
+    """
+    state = list(range(1, size * size)) + [0]
+    state[-1], state[-1 - size] = state[-1 - size], 0
+    return state
+
+
+def generate_unique_boards(count, simple_moves=None, use_random=False, size=4):
+    """
+    Gera até `count` tabuleiros distintos de tamanho `size` x `size`.
+    - Com `simple_moves`, embaralha o objetivo com esse número de movimentos.
+    - Com `use_random`, gera tabuleiros aleatórios.
+    - Caso contrário, usa o tabuleiro fixo de testes (que só gera um tabuleiro).
+    """
+    boards = []
+    generated_boards = set()  # Para garantir que os tabuleiros sejam únicos
+    while len(boards) < count:
+        board = Board(size, size)
+        if simple_moves is not None:
+            board.init_board(simple=True, num_moves=simple_moves)
+        elif use_random:
+            board.init_board()  # Gera um tabuleiro aleatório
+        else:
+            # Define um tabuleiro fixo para testes
+            board.init_board(initial_state=fixed_test_state(size))
+
+        board_tuple = tuple(board.board.flatten().tolist())
+        if board_tuple in generated_boards:
+            if simple_moves is None and not use_random:
+                break
+            continue
+        generated_boards.add(board_tuple)
+        boards.append(board)
+    return boards
+
+
+def run_job(conn, state, method, pdb_dir=None, memory_limit=None, cache_path=None):
+    """
+    Executa um único (tabuleiro, método) em um processo separado e envia o relatório por `conn`.
+    - `memory_limit`: limite de memória do processo em bytes (RLIMIT_AS).
+    - `cache_path`: banco SQLite de um `SolutionCache`, consultado e preenchido pelos métodos ótimos.
+    """
+    if memory_limit:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    try:
+        size = math.isqrt(len(state))
+        board = Board(size, size)
+        board.init_board(initial_state=state)
+        name, kwargs = BATCH_METHODS[method]
+        if pdb_dir and method in HEURISTIC_METHODS:
+            from pattern_database import AdditivePatternDatabase
+            kwargs = dict(kwargs, heuristic=AdditivePatternDatabase(pdb_dir, size, size))
+        agent = Agent(board)
+        if cache_path and name in Agent.OPTIMAL_METHODS:
+            from solution_cache import SolutionCache
+            cache = SolutionCache(cache_path)
+            report = agent.solve_with_cache(cache, name, **kwargs)
+            cache.close()
+        else:
+            report = getattr(agent, name)(**kwargs)
+        conn.send({"status": "ok", "report": report})
+    except MemoryError:
+        conn.send({"status": "memória esgotada"})
+    except ValueError as error:
+        # Por exemplo, tabuleiro sem solução ou PDBs gerados para outro tamanho de tabuleiro
+        conn.send({"status": "erro", "error": str(error)})
+    finally:
+        conn.close()
+
+
+def solve_batch(jobs, workers=1, timeout=None, memory_limit=None, pdb_dir=None, cache_path=None):
+    """
+    Resolve os `jobs` (lista de (índice do tabuleiro, estado, método)) em até `workers`
+    processos simultâneos, um processo por job.
+    - Cada job tem seu próprio `timeout` (segundos) e `memory_limit` (bytes); ao estourar
+      o tempo, o processo é encerrado.
+    Gera (índice do tabuleiro, método, resultado) à medida que os jobs terminam.
+    """
+    pending = list(jobs)
+    running = []  # (índice, método, processo, conexão, prazo)
+
+    while pending or running:
+        while pending and len(running) < workers:
+            index, state, method = pending.pop(0)
+            receiver, sender = mp.Pipe(duplex=False)
+            process = mp.Process(target=run_job, args=(sender, state, method, pdb_dir, memory_limit, cache_path))
+            process.start()
+            sender.close()
+            deadline = None if timeout is None else time.time() + timeout
+            running.append((index, method, process, receiver, deadline))
+
+        deadlines = [job[4] for job in running if job[4] is not None]
+        wait_time = max(0, min(deadlines) - time.time()) if deadlines else None
+        wait([job[3] for job in running] + [job[2].sentinel for job in running], timeout=wait_time)
+
+        still_running = []
+        for index, method, process, receiver, deadline in running:
+            if receiver.poll():
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    result = {"status": "falhou"}
+            elif not process.is_alive():
+                result = {"status": "falhou"}  # Por exemplo, encerrado pelo sistema por falta de memória
+            elif deadline is not None and time.time() >= deadline:
+                process.terminate()
+                result = {"status": "tempo esgotado"}
+            else:
+                still_running.append((index, method, process, receiver, deadline))
+                continue
+            process.join()
+            receiver.close()
+            yield index, method, result
+        running = still_running
+
+
+def format_result(method, result):
+    """
+    Converte o resultado de um job do modo em lote numa linha do relatório.
+    """
+    report = result.get("report")
+    if result["status"] != "ok" or not report["solution"]:
+        status = result["status"] if result["status"] != "ok" else "N/A"
+        if "error" in result:
+            status = f"{status}: {result['error']}"
+        return [method, status, "N/A", "N/A", "N/A", "N/A", "N/A"]
+    return [
+        method, report["nodes_expanded"], report["moves"], f"{report['time']:.4f} segundos",
+        report["max_frontier"], report["visited_size"], cache_marker(report)
+    ]
+
+
+def run_batch(args):
+    """
+    Modo em lote: gera `args.batch` tabuleiros e resolve cada (tabuleiro, método)
+    em paralelo, imprimindo os resultados conforme ficam prontos.
+    """
+    boards = generate_unique_boards(args.batch, simple_moves=args.s, use_random=args.r, size=args.size)
+    methods = args.methods or list(BATCH_METHODS)
+    jobs = [(i, board.board.flatten().tolist(), method) for i, board in enumerate(boards) for method in methods]
+    memory_limit = args.memory * 1024 * 1024 if args.memory else None
+
+    for i, board in enumerate(boards):
+        print(f"\nTabuleiro {i + 1}:")
+        print(board.board)
+
+    all_results = [{} for _ in boards]
+    searched = {method: [] for method in methods}  # Relatórios das buscas que de fato rodaram
+    cache_hits = dict.fromkeys(methods, 0)
+    for index, method, result in solve_batch(jobs, args.workers, args.timeout, memory_limit, args.pdb, args.cache):
+        row = format_result(method, result)
+        all_results[index][method] = row
+        if row[2] == "N/A":
+            print(f"Tabuleiro {index + 1} - {method}: {row[1]}")
+        elif result["report"].get("cache_hit"):
+            cache_hits[method] += 1
+            print(f"Tabuleiro {index + 1} - {method}: {row[2]} movimentos (cache)")
+        else:
+            searched[method].append(result["report"])
+            print(f"Tabuleiro {index + 1} - {method}: {row[1]} nós, {row[2]} movimentos, {row[3]}")
+
+    print("\n=== Relatório Consolidado ===")
+    for i, results in enumerate(all_results):
+        print(f"\nTabuleiro {i + 1}:")
+        display_results([results[method] for method in methods])
+
+    # Médias só das buscas executadas; os acertos de cache são contados à parte
+    print("\nMédias por método (sem as soluções vindas do cache):")
+    print(tabulate([
+        [method, len(reports), cache_hits[method],
+         np.mean([report["nodes_expanded"] for report in reports]) if reports else "N/A",
+         f"{np.mean([report['time'] for report in reports]):.4f} segundos" if reports else "N/A"]
+        for method, reports in searched.items()
+    ], headers=["Método", "Buscas", "Acertos de Cache", "Nós Expandidos", "Tempo"], tablefmt="grid"))
+
+
 if __name__ == "__main__":
     import argparse
 
     # Configuração de argumentos
     parser = argparse.ArgumentParser(description="15-Puzzle Solver")
+    parser.add_argument("--size", type=int, default=4, help="Lado do tabuleiro: 3 para o 8-puzzle, 4 para o 15-puzzle, 5 para o 24-puzzle... (padrão: 4)")
     parser.add_argument("--r", action="store_true", help="Usar tabuleiro aleatório")
     parser.add_argument("--s", type=int, nargs="?", const=10, help="Gerar um tabuleiro simples com um número de movimentos (padrão: 10)")
+    parser.add_argument("--pdb", type=str, help="Diretório com PDBs gerados por pattern_database.py, usados como heurística do A* e do IDA*")
+    parser.add_argument("--batch", type=int, help="Modo em lote: número de tabuleiros a gerar e resolver em paralelo")
+    parser.add_argument("--workers", type=int, default=mp.cpu_count(), help="Processos simultâneos no modo em lote (padrão: número de CPUs)")
+    parser.add_argument("--timeout", type=float, default=60, help="Tempo máximo por job no modo em lote, em segundos (padrão: 60)")
+    parser.add_argument("--memory", type=int, help="Memória máxima por job no modo em lote, em MB")
+    parser.add_argument("--methods", nargs="+", choices=list(BATCH_METHODS), help="Métodos usados no modo em lote (padrão: todos)")
+    parser.add_argument("--hda-workers", type=int, help="Também resolve com HDA* (A* paralelo) usando esse número de processos")
+    parser.add_argument("--cache", type=str, help="Banco SQLite com soluções ótimas já encontradas, consultado e atualizado pelos métodos ótimos")
+    parser.add_argument("--seed", type=int, help="Semente para gerar os tabuleiros de forma reprodutível")
     args = parser.parse_args()
 
+    if args.seed is not None:
+        np.random.seed(args.seed)
+
+    heuristic = None
+    if args.pdb:
+        from pattern_database import AdditivePatternDatabase
+        try:
+            heuristic = AdditivePatternDatabase(args.pdb, args.size, args.size)
+        except ValueError as error:
+            parser.error(str(error))
+
+    if args.batch:
+        run_batch(args)
+        raise SystemExit
+
+    cache = None
+    if args.cache:
+        from solution_cache import SolutionCache
+        cache = SolutionCache(args.cache)
+
     # Lista para armazenar os resultados de execução
     all_results = []
 
-    # Gera e resolve 5 tabuleiros
-    generated_boards = set()  # Para garantir que os tabuleiros sejam únicos
-    for i in range(5):
+    # Gera e resolve 5 tabuleiros únicos
+    for i, board in enumerate(generate_unique_boards(5, simple_moves=args.s, use_random=args.r, size=args.size)):
         print(f"\n=== Tabuleiro {i + 1} ===")
-        
-        # Inicializa o tabuleiro
-        board = Board()
-        while True:
-            if args.s is not None:
-                board.init_board(simple=True, num_moves=args.s)
-            elif args.r:
-                board.init_board()  # Gera um tabuleiro aleatório
-            else:
-                # Define um tabuleiro fixo para testes
-                initial_state = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 0, 13, 14, 15, 12]
-                board.init_board(initial_state=initial_state)
-
-            # Garante que o tabuleiro seja único
-            board_tuple = tuple(board.board.flatten())
-            if board_tuple not in generated_boards:
-                generated_boards.add(board_tuple)
-                break
 
         # Exibe a configuração inicial do tabuleiro
         print("Configuração inicial do tabuleiro:")
@@ -131,9 +407,12 @@ if __name__ == "__main__":
         agent = Agent(board)
 
         # Resolve o problema e coleta os resultados
-        results = solve_and_collect_results(agent, max_moves=100)
+        results = solve_and_collect_results(agent, max_moves=100, heuristic=heuristic, hda_workers=args.hda_workers, cache=cache)
         all_results.append(results)
 
+    if cache is not None:
+        cache.close()
+
     # Exibe o relatório consolidado
     print("\n=== Relatório Consolidado ===")
     for i, results in enumerate(all_results):
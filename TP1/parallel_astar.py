@@ -0,0 +1,225 @@
+import heapq
+import multiprocessing as mp
+import os
+import queue
+import time
+from board import board_tables
+from heuristics import ManhattanLinearConflict
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+_NO_SOLUTION = 1 << 30
+
+
+def owner(state, workers):
+    """
+    Processo responsável por um estado codificado (hashing multiplicativo).
+    """
+    return (((state * _GOLDEN) & _MASK64) >> 32) % workers
+
+
+def _worker(index, workers, rows, cols, heuristic, inboxes, results, sent, received, idle, incumbent, stop, batch_size, coordinator):
+    """
+    Laço de um processo do HDA*: mantém a fronteira e os visitados dos estados que
+    possui e envia, em lotes, os filhos que pertencem a outros processos.
+    Mensagens recebidas: ("nodes", lote), ("parent", estado) ou ("exit",).
+    Se o coordenador (processo `coordinator`) morrer, por exemplo encerrado ao estourar
+    o tempo de um job, o processo termina sem esperar pela mensagem de saída.
+    """
+    bits, _, goal_state, move_table, _ = board_tables(rows, cols)
+    tile_mask = (1 << bits) - 1
+    incremental = hasattr(heuristic, "delta")
+    inbox = inboxes[index]
+
+    open_list = []
+    best_g = {}  # estado -> menor g(n) conhecido
+    parents = {}
+    counter = 0
+    outboxes = [[] for _ in range(workers)]
+    stats = {"worker": index, "expanded": 0, "messages_sent": 0, "states_sent": 0, "communication_time": 0.0, "max_open": 0}
+
+    def flush():
+        for target, batch in enumerate(outboxes):
+            if batch:
+                start = time.perf_counter()
+                with sent.get_lock():
+                    sent[index] += 1
+                inboxes[target].put(("nodes", batch))
+                outboxes[target] = []
+                stats["messages_sent"] += 1
+                stats["states_sent"] += len(batch)
+                stats["communication_time"] += time.perf_counter() - start
+
+    def receive(batch):
+        nonlocal counter
+        for state, blank, g, h, parent in batch:
+            if g < best_g.get(state, g + 1):
+                best_g[state] = g
+                parents[state] = parent
+                counter += 1
+                heapq.heappush(open_list, (g + h, counter, g, h, state, blank))
+
+    def handle(message):
+        """
+        Trata uma mensagem recebida; retorna True quando o processo deve terminar.
+        """
+        if message[0] == "nodes":
+            receive(message[1])
+        elif message[0] == "parent":
+            results.put(("parent", parents.get(message[1])))
+        else:
+            stats["visited"] = len(best_g)
+            results.put(("stats", stats))
+            return True
+        return False
+
+    while True:
+        if os.getppid() != coordinator:
+            # Órfão: ninguém mais lê as filas, então não espera esvaziá-las ao sair
+            for pending in inboxes + [results]:
+                pending.cancel_join_thread()
+            return
+
+        # Recebe todas as mensagens pendentes; espera um pouco se não houver trabalho local
+        has_work = bool(open_list) and open_list[0][0] < incumbent.value and not stop.value
+        while True:
+            start = time.perf_counter()
+            try:
+                message = inbox.get_nowait() if has_work else inbox.get(timeout=0.005)
+            except queue.Empty:
+                break
+            if has_work:
+                stats["communication_time"] += time.perf_counter() - start
+            idle[index] = 0
+            with received.get_lock():
+                received[index] += 1
+            if handle(message):
+                return
+            has_work = not stop.value
+
+        if stop.value:
+            continue  # Só responde às consultas de pais até receber ("exit",)
+        if not open_list or open_list[0][0] >= incumbent.value:
+            flush()
+            idle[index] = 1
+            continue
+        idle[index] = 0
+
+        for _ in range(batch_size):
+            if not open_list or open_list[0][0] >= incumbent.value:
+                break
+            f, _, g, h, state, blank = heapq.heappop(open_list)
+            if g > best_g[state]:
+                continue  # Entrada obsoleta
+            stats["expanded"] += 1
+            if state == goal_state:
+                with incumbent.get_lock():
+                    if g < incumbent.value:
+                        incumbent.value = g
+                continue
+
+            g_new = g + 1
+            for target in move_table[blank]:
+                shift = bits * target
+                tile = (state >> shift) & tile_mask
+                child = state - (tile << shift) + (tile << (bits * blank))
+                if incremental:
+                    h_child = h + heuristic.delta(state, tile, target, blank)
+                else:
+                    h_child = heuristic(child)
+                if g_new + h_child >= incumbent.value:
+                    continue
+                entry = (child, target, g_new, h_child, state)
+                destination = owner(child, workers)
+                if destination == index:
+                    receive([entry])
+                else:
+                    outboxes[destination].append(entry)
+                    if len(outboxes[destination]) >= batch_size:
+                        flush()
+        stats["max_open"] = max(stats["max_open"], len(open_list))
+        flush()
+
+
+def hda_star(initial_state, initial_blank, rows, cols, workers=2, heuristic=None, batch_size=64, time_limit=None):
+    """
+    A* paralelo com distribuição por hash (HDA*): cada estado pertence a um único processo,
+    que guarda a sua fronteira e os seus visitados; os filhos gerados são enviados ao
+    dono em lotes de até `batch_size` estados, por filas entre processos.
+    - O custo da melhor solução encontrada fica em memória compartilhada e poda a busca.
+    - A busca termina quando todos os processos estão ociosos (fronteira vazia ou com
+      f(n) >= melhor custo) e todas as mensagens enviadas foram recebidas; com uma
+      heurística admissível, a solução é então ótima.
+    - `heuristic`: heurística incremental ou função de estados codificados; por padrão,
+      Manhattan + conflito linear. Precisa ser serializável com `pickle`.
+    - O tempo de comunicação de cada processo soma os envios e as leituras de mensagens
+      feitas enquanto havia trabalho local (a espera ociosa não é contada).
+    Retorna (caminho de estados codificados ou None, estatísticas por processo, se o tempo acabou).
+    """
+    if heuristic is None:
+        heuristic = ManhattanLinearConflict(rows, cols)
+    incremental = hasattr(heuristic, "delta")
+    h = heuristic.initial(initial_state) if incremental else heuristic(initial_state)
+
+    inboxes = [mp.Queue() for _ in range(workers)]
+    results = mp.Queue()
+    sent = mp.Array("q", workers + 1)  # A última posição conta a mensagem inicial
+    received = mp.Array("q", workers)
+    idle = mp.Array("b", workers, lock=False)
+    incumbent = mp.Value("i", _NO_SOLUTION)
+    stop = mp.Value("b", 0, lock=False)
+
+    processes = [
+        mp.Process(
+            target=_worker,
+            args=(i, workers, rows, cols, heuristic, inboxes, results, sent, received, idle, incumbent, stop, batch_size, os.getpid()),
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    sent[workers] += 1
+    inboxes[owner(initial_state, workers)].put(("nodes", [(initial_state, initial_blank, 0, h, None)]))
+
+    # Detecção de término: todos ociosos e nenhuma mensagem em trânsito, duas vezes seguidas
+    deadline = None if time_limit is None else time.time() + time_limit
+    timed_out = False
+    previous = None
+    while True:
+        time.sleep(0.002)
+        if deadline is not None and time.time() >= deadline:
+            timed_out = True
+            break
+        counts = (sum(sent[:]), sum(received[:]))
+        if all(idle[:]) and counts[0] == counts[1]:
+            if previous == counts:
+                break
+            previous = counts
+        else:
+            previous = None
+    stop.value = 1
+
+    path = None
+    if not timed_out and incumbent.value < _NO_SOLUTION:
+        goal_state = board_tables(rows, cols)[2]
+        path = [goal_state]
+        while True:
+            inboxes[owner(path[-1], workers)].put(("parent", path[-1]))
+            parent = results.get()[1]
+            if parent is None:
+                break
+            path.append(parent)
+        path.reverse()
+
+    for inbox in inboxes:
+        inbox.put(("exit",))
+    stats = []
+    while len(stats) < workers:
+        message = results.get()
+        if message[0] == "stats":
+            stats.append(message[1])
+    for process in processes:
+        process.join()
+    stats.sort(key=lambda entry: entry["worker"])
+    return path, stats, timed_out
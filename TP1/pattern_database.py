@@ -0,0 +1,222 @@
+import json
+import mmap
+import os
+from board import COLS, ROWS, bits_per_tile
+
+UNSEEN = 255  # Valor das entradas ainda não alcançadas pela busca
+
+# Partições disjuntas pré-definidas para o 15-puzzle
+PARTITIONS = {
+    "5-5-5": [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12, 13, 14, 15]],
+    "6-6-3": [[1, 5, 6, 9, 10, 13], [7, 8, 11, 12, 14, 15], [2, 3, 4]],
+}
+
+
+def permutation_weights(size, k):
+    """
+    Pesos usados para ranquear arranjos de k posições distintas entre `size`:
+    weights[i] = (size - 1 - i)! / (size - k)!.
+    """
+    weights = [1] * k
+    for i in range(k - 2, -1, -1):
+        weights[i] = weights[i + 1] * (size - 1 - i)
+    return weights
+
+
+def table_size(size, k):
+    """
+    Número de arranjos de k posições distintas entre `size` (size! / (size - k)!).
+    """
+    total = 1
+    for i in range(k):
+        total *= size - i
+    return total
+
+
+def rank_positions(positions, weights):
+    """
+    Índice lexicográfico de um arranjo de posições distintas, em [0, size! / (size - k)!).
+    """
+    rank = 0
+    for i, pos in enumerate(positions):
+        smaller = 0
+        for j in range(i):
+            if positions[j] < pos:
+                smaller += 1
+        rank += (pos - smaller) * weights[i]
+    return rank
+
+
+def build_pattern_database(pattern, rows=ROWS, cols=COLS):
+    """
+    Constrói o PDB aditivo de um padrão por BFS retrógrada a partir do objetivo.
+    - Só os movimentos das peças do padrão custam 1; os movimentos do 0 entre peças
+      que não pertencem ao padrão são gratuitos, o que torna os PDBs de padrões
+      disjuntos somáveis.
+    - O 0 é representado pela menor posição da região que ele alcança sem mover
+      peças do padrão.
+    Retorna um `bytearray` indexado por `rank_positions` das posições das peças.
+    """
+    size = rows * cols
+    k = len(pattern)
+    weights = permutation_weights(size, k)
+    full = (1 << size) - 1
+
+    # Máscaras para expandir regiões por operações de bits
+    not_first_col = full
+    not_last_col = full
+    for row in range(rows):
+        not_first_col &= ~(1 << (row * cols))
+        not_last_col &= ~(1 << (row * cols + cols - 1))
+    neighbors = []
+    for pos in range(size):
+        row, col = divmod(pos, cols)
+        cells = []
+        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            r, c = row + dr, col + dc
+            if 0 <= r < rows and 0 <= c < cols:
+                cells.append(r * cols + c)
+        neighbors.append(cells)
+
+    def blank_region(start, occupied):
+        """
+        Região (máscara de bits) alcançável pelo 0 a partir de `start`.
+        """
+        free = full & ~occupied
+        region = 1 << start
+        while True:
+            grown = region | ((region << 1) & not_first_col) | ((region >> 1) & not_last_col)
+            grown |= (region << cols) | (region >> cols)
+            grown &= free
+            if grown == region:
+                return region
+            region = grown
+
+    table = bytearray([UNSEEN]) * table_size(size, k)
+    visited = bytearray(len(table) * size)
+
+    goal_positions = tuple(tile - 1 for tile in pattern)
+    occupied = sum(1 << pos for pos in goal_positions)
+    region = blank_region(size - 1, occupied)
+    rep = (region & -region).bit_length() - 1
+    rank = rank_positions(goal_positions, weights)
+    visited[rank * size + rep] = 1
+    table[rank] = 0
+
+    layer = [(goal_positions, region)]
+    distance = 0
+    while layer:
+        distance += 1
+        next_layer = []
+        for positions, region in layer:
+            occupied = sum(1 << pos for pos in positions)
+            for i, pos in enumerate(positions):
+                for target in neighbors[pos]:
+                    if not (region >> target) & 1:
+                        continue
+                    # A peça i entra na região do 0; o 0 passa a ocupar `pos`
+                    child = positions[:i] + (target,) + positions[i + 1:]
+                    child_region = blank_region(pos, occupied ^ (1 << pos) ^ (1 << target))
+                    child_rep = (child_region & -child_region).bit_length() - 1
+                    child_rank = rank_positions(child, weights)
+                    key = child_rank * size + child_rep
+                    if visited[key]:
+                        continue
+                    visited[key] = 1
+                    if table[child_rank] == UNSEEN:
+                        table[child_rank] = distance
+                    next_layer.append((child, child_region))
+        layer = next_layer
+
+    return table
+
+
+def build_additive_pdbs(partition, directory, rows=ROWS, cols=COLS):
+    """
+    Constrói e grava em `directory` um PDB por padrão da partição, além de um
+    `manifest.json` com a descrição dos arquivos.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"rows": rows, "cols": cols, "patterns": []}
+    for pattern in partition:
+        filename = "pdb_" + "-".join(str(tile) for tile in pattern) + ".bin"
+        print(f"Construindo PDB para as peças {pattern}...")
+        table = build_pattern_database(pattern, rows, cols)
+        with open(os.path.join(directory, filename), "wb") as f:
+            f.write(table)
+        manifest["patterns"].append({"tiles": list(pattern), "file": filename})
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+class AdditivePatternDatabase:
+    """
+    Heurística aditiva de PDBs disjuntos, carregados de disco via `mmap`.
+    As páginas são compartilhadas entre processos que abrem os mesmos arquivos.
+    Chamada com um estado codificado (ver `Board.to_packed`), retorna a soma dos PDBs.
+    - `rows`, `cols`: se fornecidos, o tamanho do tabuleiro em que os PDBs serão usados;
+      PDBs gerados para outro tamanho são recusados com `ValueError`.
+    """
+
+    def __init__(self, directory, rows=None, cols=None):
+        self.directory = directory
+        with open(os.path.join(directory, "manifest.json")) as f:
+            manifest = json.load(f)
+        self.rows = manifest["rows"]
+        self.cols = manifest["cols"]
+        if rows is not None and (self.rows, self.cols) != (rows, cols):
+            raise ValueError(
+                f"Os PDBs de {directory} foram gerados para o tabuleiro {self.rows}x{self.cols}, não {rows}x{cols}."
+            )
+        self.size = self.rows * self.cols
+        tiles = [tile for entry in manifest["patterns"] for tile in entry["tiles"]]
+        if len(set(tiles)) != len(tiles) or not all(0 < tile < self.size for tile in tiles):
+            raise ValueError(f"A partição dos PDBs de {directory} não é válida para o tabuleiro {self.rows}x{self.cols}.")
+        self.bits = bits_per_tile(self.size)
+        self.tile_mask = (1 << self.bits) - 1
+        self.patterns = []
+        self._files = []
+        for entry in manifest["patterns"]:
+            tiles = entry["tiles"]
+            f = open(os.path.join(directory, entry["file"]), "rb")
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(table) != table_size(self.size, len(tiles)):
+                raise ValueError(f"Arquivo de PDB com tamanho inesperado: {entry['file']}")
+            self._files.append(f)
+            self.patterns.append((tiles, permutation_weights(self.size, len(tiles)), table))
+
+    def __reduce__(self):
+        # Ao ser enviado a outro processo, reabre os mesmos arquivos em vez de copiá-los
+        return AdditivePatternDatabase, (self.directory, self.rows, self.cols)
+
+    def __call__(self, packed):
+        where = [0] * self.size
+        for pos in range(self.size):
+            where[(packed >> (self.bits * pos)) & self.tile_mask] = pos
+        return self.from_positions(where)
+
+    def from_positions(self, where):
+        """
+        Valor da heurística dado `where[tile]` = posição de cada peça.
+        """
+        total = 0
+        for tiles, weights, table in self.patterns:
+            total += table[rank_positions([where[tile] for tile in tiles], weights)]
+        return total
+
+    def close(self):
+        for _, _, table in self.patterns:
+            table.close()
+        for f in self._files:
+            f.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gera PDBs aditivos para o 15-puzzle")
+    parser.add_argument("--partition", default="5-5-5", choices=sorted(PARTITIONS), help="Partição das peças (padrão: 5-5-5)")
+    parser.add_argument("--out", default="pdb", help="Diretório de saída (padrão: pdb)")
+    args = parser.parse_args()
+
+    build_additive_pdbs(PARTITIONS[args.partition], args.out)
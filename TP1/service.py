@@ -0,0 +1,287 @@
+import asyncio
+import json
+import math
+import multiprocessing as mp
+import sys
+import time
+from board import Board
+from main import BATCH_METHODS, HEURISTIC_METHODS, run_job
+
+# Limites superiores (segundos) das faixas do histograma de latência
+LATENCY_BUCKETS = (0.01, 0.1, 1, 10, 60, math.inf)
+
+
+class SolveService:
+    """
+    Serviço assíncrono de resolução: recebe pedidos em JSON (um por linha) e responde
+    com o resultado de cada um assim que fica pronto, não necessariamente na ordem.
+    - Cada pedido roda em um processo próprio (`main.run_job`), com no máximo `workers`
+      simultâneos; os demais esperam na fila.
+    - Ao estourar o prazo do pedido, o processo é encerrado de fato.
+    - Pedidos idênticos (mesmo estado e método) em andamento compartilham a mesma busca.
+    Pedido: {"id": ..., "state": [...], "method": "IDA*", "deadline": segundos}
+    ou {"id": ..., "command": "metrics"}.
+    """
+
+    def __init__(self, workers=1, timeout=60, memory_limit=None, pdb_dir=None):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.pdb_dir = pdb_dir
+        self.pdb_shape = None  # (linhas, colunas) do tabuleiro para o qual os PDBs foram gerados
+        if pdb_dir:
+            from pattern_database import AdditivePatternDatabase
+            pdb = AdditivePatternDatabase(pdb_dir)
+            self.pdb_shape = (pdb.rows, pdb.cols)
+            pdb.close()
+        self.semaphore = asyncio.Semaphore(workers)
+        self.in_flight = {}  # (estado, método) -> {"task": ..., "waiters": ...}
+
+        self.start_time = time.time()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.latency_histogram = [0] * len(LATENCY_BUCKETS)
+
+    async def _run(self, state, method):
+        """
+        Executa um job em um processo novo, esperando o resultado sem bloquear o laço de
+        eventos. Se a tarefa for cancelada, o processo é encerrado.
+        """
+        self.queued += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.running += 1
+        receiver, sender = mp.Pipe(duplex=False)
+        process = mp.Process(target=run_job, args=(sender, state, method, self.pdb_dir, self.memory_limit))
+        loop = asyncio.get_running_loop()
+        try:
+            process.start()
+            sender.close()
+            ready = loop.create_future()
+            loop.add_reader(receiver.fileno(), lambda: ready.done() or ready.set_result(None))
+            try:
+                await ready
+            finally:
+                loop.remove_reader(receiver.fileno())
+            try:
+                return receiver.recv()
+            except EOFError:
+                return {"status": "falhou"}
+        finally:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            receiver.close()
+            self.running -= 1
+            self.semaphore.release()
+
+    async def solve(self, request):
+        """
+        Resolve um pedido, reaproveitando uma busca idêntica em andamento, e retorna a resposta.
+        """
+        start = time.perf_counter()
+        response = {"id": request.get("id")}
+        state = request.get("state")
+        method = request.get("method", "IDA*")
+        deadline = request.get("deadline", self.timeout)
+        if method not in BATCH_METHODS:
+            response.update(status="erro", error=f"Método desconhecido: {method}")
+        elif (not isinstance(state, list) or math.isqrt(len(state)) ** 2 != len(state)
+              or not all(isinstance(tile, int) and not isinstance(tile, bool) for tile in state)
+              or sorted(state) != list(range(len(state)))):
+            response.update(status="erro", error="Estado inválido")
+        elif isinstance(deadline, bool) or not isinstance(deadline, (int, float)) or not 0 < deadline < math.inf:
+            response.update(status="erro", error=f"Prazo inválido: {deadline}")
+        elif self.pdb_shape and method in HEURISTIC_METHODS and self.pdb_shape != (math.isqrt(len(state)),) * 2:
+            response.update(status="erro", error=f"Os PDBs do serviço são para o tabuleiro {self.pdb_shape[0]}x{self.pdb_shape[1]}")
+        else:
+            size = math.isqrt(len(state))
+            board = Board(size, size)
+            try:
+                board.init_board(initial_state=state)
+            except ValueError:
+                response.update(status="erro", error="Tabuleiro não solucionável")
+        if "status" in response:
+            self.errors += 1
+            return response
+
+        key = (tuple(state), method)
+        entry = self.in_flight.get(key)
+        if entry is None:
+            entry = {"task": asyncio.create_task(self._run(state, method)), "waiters": 0}
+            self.in_flight[key] = entry
+            entry["task"].add_done_callback(lambda _: self.in_flight.pop(key, None) if self.in_flight.get(key) is entry else None)
+        else:
+            self.coalesced += 1
+        entry["waiters"] += 1
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(entry["task"]), deadline)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            result = {"status": "tempo esgotado"}
+        finally:
+            entry["waiters"] -= 1
+            # Ninguém mais espera por esta busca: encerra o processo
+            if entry["waiters"] == 0 and not entry["task"].done():
+                entry["task"].cancel()
+
+        report = result.get("report")
+        if result["status"] == "ok" and report["solution"]:
+            response.update(
+                status="ok", moves=report["moves"], nodes_expanded=report["nodes_expanded"],
+                time=report["time"], solution=report["solution"],
+            )
+        else:
+            response["status"] = result["status"] if result["status"] != "ok" else "sem solução"
+            if "error" in result:
+                response["error"] = result["error"]
+            if result["status"] in ("falhou", "erro"):
+                self.errors += 1
+
+        latency = time.perf_counter() - start
+        self.completed += 1
+        self.latency_histogram[next(i for i, limit in enumerate(LATENCY_BUCKETS) if latency <= limit)] += 1
+        response["latency"] = latency
+        return response
+
+    def metrics(self):
+        uptime = time.time() - self.start_time
+        return {
+            "uptime": uptime,
+            "queue_depth": self.queued,
+            "running": self.running,
+            "in_flight": len(self.in_flight),
+            "completed": self.completed,
+            "throughput": self.completed / uptime if uptime > 0 else 0.0,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "latency_histogram": {
+                ("+inf" if math.isinf(limit) else f"<={limit}"): count
+                for limit, count in zip(LATENCY_BUCKETS, self.latency_histogram)
+            },
+        }
+
+    async def handle_line(self, line, write):
+        """
+        Trata uma linha recebida e escreve a resposta com `write`.
+        """
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            self.errors += 1
+            await write({"status": "erro", "error": "JSON inválido"})
+            return
+        if not isinstance(request, dict):
+            self.errors += 1
+            await write({"status": "erro", "error": "Pedido inválido"})
+        elif request.get("command") == "metrics":
+            await write(dict(self.metrics(), id=request.get("id"), status="ok"))
+        else:
+            # Todo pedido recebe uma resposta, mesmo que a resolução falhe de forma inesperada
+            try:
+                response = await self.solve(request)
+            except Exception as error:
+                self.errors += 1
+                response = {"id": request.get("id"), "status": "erro", "error": repr(error)}
+            await write(response)
+
+    async def serve_stream(self, reader, writer):
+        """
+        Atende uma conexão: lê pedidos linha a linha e trata cada um em paralelo.
+        """
+        lock = asyncio.Lock()
+
+        async def write(response):
+            async with lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        tasks = set()
+        while line := await reader.readline():
+            if line.strip():
+                task = asyncio.create_task(self.handle_line(line, write))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+        writer.close()
+
+
+class FileWriter:
+    """
+    Escritor com a interface usada por `serve_stream` que grava de forma bloqueante em
+    um arquivo comum (o asyncio só monitora pipes, sockets e terminais).
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, data):
+        self.stream.write(data)
+        self.stream.flush()
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.stream.flush()
+
+
+async def serve_stdio(service):
+    """
+    Lê os pedidos da entrada padrão e escreve as respostas na saída padrão.
+    Entrada e saída podem ser pipes, terminais ou arquivos redirecionados
+    (`service.py < pedidos.jsonl > respostas.jsonl`).
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except ValueError:
+        # Arquivo comum: já está todo disponível
+        reader.feed_data(sys.stdin.buffer.read())
+        reader.feed_eof()
+    try:
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    except ValueError:
+        writer = FileWriter(sys.stdout.buffer)
+    await service.serve_stream(reader, writer)
+
+
+async def serve_unix(service, path):
+    """
+    Atende clientes em um socket Unix até o processo ser interrompido.
+    """
+    server = await asyncio.start_unix_server(service.serve_stream, path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serviço de resolução do 15-puzzle (JSON por linha)")
+    parser.add_argument("--socket", type=str, help="Caminho do socket Unix (padrão: entrada e saída padrão)")
+    parser.add_argument("--workers", type=int, default=mp.cpu_count(), help="Buscas simultâneas (padrão: número de CPUs)")
+    parser.add_argument("--timeout", type=float, default=60, help="Prazo padrão por pedido, em segundos (padrão: 60)")
+    parser.add_argument("--memory", type=int, help="Memória máxima por busca, em MB")
+    parser.add_argument("--pdb", type=str, help="Diretório com PDBs usados pelos métodos com heurística")
+    args = parser.parse_args()
+
+    async def run():
+        service = SolveService(args.workers, args.timeout, args.memory * 1024 * 1024 if args.memory else None, args.pdb)
+        if args.socket:
+            await serve_unix(service, args.socket)
+        else:
+            await serve_stdio(service)
+
+    asyncio.run(run())
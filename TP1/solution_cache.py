@@ -0,0 +1,95 @@
+import sqlite3
+import time
+from board import bits_per_tile
+
+
+class SolutionCache:
+    """
+    Cache persistente de soluções ótimas em SQLite, compartilhado entre execuções e processos.
+    Cada estado (codificado como em `Board.to_packed`) guarda a distância ótima até o
+    objetivo e a posição para onde o 0 se move no próximo passo do caminho ótimo.
+    - `max_entries`: limite de estados; os usados há mais tempo são descartados (LRU).
+    - `read_only`: abre o banco só para leitura, sem atualizar a ordem de uso. O banco
+      usa o modo WAL, então vários leitores podem consultá-lo enquanto outro processo escreve.
+    Cada processo deve abrir a sua própria instância.
+    """
+
+    def __init__(self, path, max_entries=None, read_only=False):
+        self.path = path
+        self.max_entries = max_entries
+        self.read_only = read_only
+        if read_only:
+            self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+            return
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS solutions ("
+            "rows INTEGER NOT NULL, cols INTEGER NOT NULL, state BLOB NOT NULL, "
+            "distance INTEGER NOT NULL, next_blank INTEGER NOT NULL, last_used REAL NOT NULL, "
+            "UNIQUE (rows, cols, state))"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)")
+        self.connection.commit()
+
+    @staticmethod
+    def key(rows, cols, packed):
+        """
+        Chave canônica do estado: o inteiro codificado em bytes (little-endian).
+        """
+        return packed.to_bytes((rows * cols * bits_per_tile(rows * cols) + 7) // 8, "little")
+
+    def get(self, rows, cols, packed):
+        """
+        Retorna (distância ótima, próxima posição do 0) do estado, ou None se ele não
+        estiver no cache. No objetivo, a próxima posição do 0 é -1.
+        Só lê o banco; a ordem de uso é atualizada por `touch`.
+        """
+        return self.connection.execute(
+            "SELECT distance, next_blank FROM solutions WHERE rows = ? AND cols = ? AND state = ?",
+            (rows, cols, self.key(rows, cols, packed)),
+        ).fetchone()
+
+    def touch(self, rows, cols, states):
+        """
+        Marca os estados codificados `states` (por exemplo, um caminho encontrado no cache)
+        como usados agora, em uma única transação.
+        """
+        if self.read_only:
+            return
+        now = time.time()
+        self.connection.executemany(
+            "UPDATE solutions SET last_used = ? WHERE rows = ? AND cols = ? AND state = ?",
+            [(now, rows, cols, self.key(rows, cols, packed)) for packed in states],
+        )
+        self.connection.commit()
+
+    def put_path(self, rows, cols, path):
+        """
+        Registra todos os estados de um caminho ótimo.
+        - `path`: lista de (estado codificado, posição do 0), do estado inicial ao objetivo.
+        """
+        now = time.time()
+        entries = []
+        for i, (packed, _) in enumerate(path):
+            next_blank = path[i + 1][1] if i + 1 < len(path) else -1
+            entries.append((rows, cols, self.key(rows, cols, packed), len(path) - 1 - i, next_blank, now))
+        self.connection.executemany(
+            "INSERT INTO solutions (rows, cols, state, distance, next_blank, last_used) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (rows, cols, state) DO UPDATE SET "
+            "distance = excluded.distance, next_blank = excluded.next_blank, last_used = excluded.last_used",
+            entries,
+        )
+        if self.max_entries is not None:
+            self.connection.execute(
+                "DELETE FROM solutions WHERE rowid IN ("
+                "SELECT rowid FROM solutions ORDER BY last_used LIMIT max(0, (SELECT COUNT(*) FROM solutions) - ?))",
+                (self.max_entries,),
+            )
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
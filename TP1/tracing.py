@@ -0,0 +1,91 @@
+import json
+import time
+from collections import Counter
+
+
+class SearchTracer:
+    """
+    Observador opcional das buscas do `Agent` (BFS, DFS e A*).
+    Os algoritmos só chamam os métodos abaixo quando recebem um tracer, então a
+    instrumentação não custa nada quando desativada; quando ativada, usa apenas contadores.
+    - `progress_every`: a cada N expansões, gera um snapshot do progresso.
+    - `progress_stream`: arquivo (ou objeto com `write`) que recebe cada snapshot como
+      uma linha JSON.
+    - `on_progress`: função chamada com cada snapshot.
+    - `label`: identificação incluída nos snapshots (por exemplo, o nome do método).
+    """
+
+    def __init__(self, progress_every=None, progress_stream=None, on_progress=None, label=None):
+        self.progress_every = progress_every
+        self.progress_stream = progress_stream
+        self.on_progress = on_progress
+        self.label = label
+
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.duplicates = 0
+        self.max_frontier = 0
+        self.heuristic_calls = 0
+        self.heuristic_time = 0.0
+        self.expanded_per_layer = Counter()  # Profundidade (BFS/DFS) ou f(n) (A*) -> expansões
+        self.start_time = time.perf_counter()
+
+    def expanded(self, layer, frontier_size):
+        """
+        Um nó foi expandido na camada `layer` com a fronteira de tamanho `frontier_size`.
+        """
+        self.nodes_expanded += 1
+        self.expanded_per_layer[layer] += 1
+        if frontier_size > self.max_frontier:
+            self.max_frontier = frontier_size
+        if self.progress_every and self.nodes_expanded % self.progress_every == 0:
+            self.emit()
+
+    def generated(self, count=1):
+        """
+        `count` filhos foram gerados e colocados na fronteira.
+        """
+        self.nodes_generated += count
+
+    def duplicate(self, count=1):
+        """
+        `count` estados foram descartados por já terem sido visitados.
+        """
+        self.duplicates += count
+
+    def heuristic(self, elapsed, calls=1):
+        """
+        Tempo gasto (em segundos) em `calls` avaliações da heurística.
+        """
+        self.heuristic_calls += calls
+        self.heuristic_time += elapsed
+
+    def snapshot(self):
+        """
+        Estado atual dos contadores em um dicionário serializável em JSON.
+        """
+        elapsed = time.perf_counter() - self.start_time
+        return {
+            "label": self.label,
+            "elapsed": elapsed,
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "duplicates": self.duplicates,
+            "max_frontier": self.max_frontier,
+            "heuristic_calls": self.heuristic_calls,
+            "heuristic_time": self.heuristic_time,
+            "expansions_per_second": self.nodes_expanded / elapsed if elapsed > 0 else None,
+            "expanded_per_layer": {str(layer): count for layer, count in sorted(self.expanded_per_layer.items())},
+        }
+
+    def emit(self):
+        """
+        Envia um snapshot para `progress_stream` e `on_progress`.
+        """
+        snapshot = self.snapshot()
+        if self.progress_stream is not None:
+            self.progress_stream.write(json.dumps(snapshot) + "\n")
+            self.progress_stream.flush()
+        if self.on_progress is not None:
+            self.on_progress(snapshot)
+        return snapshot
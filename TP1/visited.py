@@ -0,0 +1,153 @@
+import math
+import sys
+import numpy as np
+
+EMPTY = 0  # Nenhum estado válido é codificado como 0 (só uma posição contém o 0)
+_GOLDEN = 0x9E3779B97F4A7C15  # Constante do hashing multiplicativo (Fibonacci)
+_SECOND = 0xC2B2AE3D27D4EB4F
+_MASK64 = (1 << 64) - 1
+
+
+class PackedStateTable:
+    """
+    Conjunto de estados visitados com os respectivos pais, em uma tabela hash de
+    endereçamento aberto (sondagem linear) sobre dois arrays `uint64` do numpy.
+    Substitui o dicionário {estado: pai} das buscas com bem menos memória por estado.
+    - Só aceita estados codificados em até 64 bits (tabuleiros de até 4x4).
+    - A tabela dobra de tamanho quando a ocupação passa de `max_load`.
+    - O pai None (estado inicial) é guardado como `EMPTY`.
+    """
+
+    def __init__(self, capacity=1 << 16, max_load=0.5):
+        self.max_load = max_load
+        self._size = 0
+        self._allocate(1 << max(4, (capacity - 1).bit_length()))
+
+    def _allocate(self, capacity):
+        self._keys = np.zeros(capacity, dtype=np.uint64)
+        self._values = np.zeros(capacity, dtype=np.uint64)
+        self._mask = capacity - 1
+        self._shift = 64 - (capacity.bit_length() - 1)
+        self._limit = int(capacity * self.max_load)
+
+    def _slot(self, key):
+        """
+        Posição de `key` na tabela, ou da primeira posição livre na sua sequência de sondagem.
+        """
+        slot = ((key * _GOLDEN) & _MASK64) >> self._shift
+        keys = self._keys
+        while True:
+            current = keys.item(slot)
+            if current == key or current == EMPTY:
+                return slot
+            slot = (slot + 1) & self._mask
+
+    def __contains__(self, key):
+        return self._keys.item(self._slot(key)) != EMPTY
+
+    def __getitem__(self, key):
+        slot = self._slot(key)
+        if self._keys.item(slot) == EMPTY:
+            raise KeyError(key)
+        parent = self._values.item(slot)
+        return None if parent == EMPTY else parent
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __setitem__(self, key, parent):
+        slot = self._slot(key)
+        if self._keys.item(slot) == EMPTY:
+            if self._size >= self._limit:
+                self._grow()
+                slot = self._slot(key)
+            self._keys[slot] = key
+            self._size += 1
+        self._values[slot] = EMPTY if parent is None else parent
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self):
+        """
+        Dobra a capacidade e reinsere todos os estados de uma vez, de forma vetorizada.
+        """
+        occupied = self._keys != EMPTY
+        keys, values = self._keys[occupied], self._values[occupied]
+        self._allocate(2 * len(self._keys))
+        slots = (keys * np.uint64(_GOLDEN)) >> np.uint64(self._shift)
+        while keys.size:
+            # Entre as chaves cuja posição está livre, a primeira de cada posição é inserida;
+            # as demais seguem para a próxima posição da sondagem
+            candidates = np.flatnonzero(self._keys[slots] == EMPTY)
+            _, first = np.unique(slots[candidates], return_index=True)
+            placed = candidates[first]
+            self._keys[slots[placed]] = keys[placed]
+            self._values[slots[placed]] = values[placed]
+            pending = np.ones(keys.size, dtype=bool)
+            pending[placed] = False
+            keys, values = keys[pending], values[pending]
+            slots = (slots[pending] + np.uint64(1)) & np.uint64(self._mask)
+
+    @property
+    def nbytes(self):
+        return self._keys.nbytes + self._values.nbytes
+
+    def bytes_per_state(self):
+        return self.nbytes / self._size if self._size else 0.0
+
+
+class BloomFilter:
+    """
+    Conjunto aproximado de estados visitados: pode dizer que um estado novo já foi
+    visitado (com probabilidade ~`error_rate` para até `capacity` estados), mas nunca
+    o contrário. Não guarda os pais, então só serve para a DFS, que reconstrói o
+    caminho a partir da pilha; com falsos positivos, a busca pode perder soluções.
+    """
+
+    approximate = True
+
+    def __init__(self, capacity=1 << 20, error_rate=0.01):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self._size = 0
+
+    def _positions(self, key):
+        # Hashing duplo: a i-ésima posição é h1 + i * h2
+        h1 = (key * _GOLDEN) & _MASK64
+        h2 = ((key * _SECOND) & _MASK64) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, key):
+        bits = self._bits
+        for pos in self._positions(key):
+            if not (bits.item(pos >> 3) >> (pos & 7)) & 1:
+                return False
+        return True
+
+    def add(self, key):
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self._size += 1
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        return self._bits.nbytes
+
+    def bytes_per_state(self):
+        return self.nbytes / self._size if self._size else 0.0
+
+
+def visited_nbytes(visited):
+    """
+    Memória ocupada pelo conjunto de visitados. Para dicionários, soma a tabela
+    interna e os inteiros usados como chave (os pais são os mesmos objetos).
+    """
+    if hasattr(visited, "nbytes"):
+        return visited.nbytes
+    return sys.getsizeof(visited) + sum(sys.getsizeof(state) for state in visited)
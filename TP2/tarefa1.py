@@ -1,13 +1,51 @@
+import csv
+import hashlib
+import json
+import os
+import time
 import numpy as np
 import pandas as pd
-import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List, Tuple
 import matplotlib.pyplot as plt
+from torneio import sortear_competidores
+
+
+# Funções objetivo (minimização): recebem uma matriz (n, d) e retornam os n valores
+def sphere(population: np.ndarray) -> np.ndarray:
+    return np.sum(population**2, axis=-1)
+
+
+def rastrigin(population: np.ndarray) -> np.ndarray:
+    return 10 * population.shape[-1] + np.sum(population**2 - 10 * np.cos(2 * np.pi * population), axis=-1)
+
+
+def rosenbrock(population: np.ndarray) -> np.ndarray:
+    x, y = population[..., :-1], population[..., 1:]
+    return np.sum(100 * (y - x**2)**2 + (1 - x)**2, axis=-1)
+
+
+def ackley(population: np.ndarray) -> np.ndarray:
+    return (-20 * np.exp(-0.2 * np.sqrt(np.mean(population**2, axis=-1)))
+            - np.exp(np.mean(np.cos(2 * np.pi * population), axis=-1)) + 20 + np.e)
+
+
+# Nome -> (função, intervalo padrão das variáveis)
+OBJECTIVES = {
+    'sphere': (sphere, (-5.0, 5.0)),
+    'rastrigin': (rastrigin, (-5.12, 5.12)),
+    'rosenbrock': (rosenbrock, (-2.048, 2.048)),
+    'ackley': (ackley, (-32.768, 32.768)),
+}
+
 
 class GeneticAlgorithm:
     def __init__(self, population_size, mutation_rate, 
                  tournament_size, crossover_rate, 
-                 elitism_count, max_generations):
+                 elitism_count, max_generations, seed=None,
+                 target_fitness=None, stagnation_window=None, stagnation_tolerance=0.0,
+                 diversity_threshold=None, time_limit=None, max_evaluations=None,
+                 objective='sphere', num_variables=10, bounds=None, cache_fitness=False):
         
         self.population_size = population_size
         self.mutation_rate = mutation_rate
@@ -16,146 +54,345 @@ class GeneticAlgorithm:
         self.elitism_count = elitism_count
         self.max_generations = max_generations
 
-        # Problema dado na tarefa
-        self.num_variables = 10
-        self.min_value = -5.0
-        self.max_value = 5.0
+        # Critérios de parada (None desativa o critério)
+        self.target_fitness = target_fitness
+        self.stagnation_window = stagnation_window
+        self.stagnation_tolerance = stagnation_tolerance
+        self.diversity_threshold = diversity_threshold
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.convergence = None
+        if not 0 < tournament_size <= population_size:
+            raise ValueError(f"O tamanho do torneio ({tournament_size}) deve estar entre 1 e o tamanho da população ({population_size})")
+
+        # Problema: por padrão, o da tarefa (esfera com 10 variáveis em [-5, 5]).
+        # `objective` é o nome de uma função de OBJECTIVES ou uma função que recebe a
+        # população inteira (n, d) e retorna os n valores a minimizar.
+        if isinstance(objective, str):
+            objective, default_bounds = OBJECTIVES[objective]
+        else:
+            default_bounds = (-5.0, 5.0)
+        self.objective = objective
+        self.num_variables = num_variables
+        self.min_value, self.max_value = bounds if bounds is not None else default_bounds
+
+        # Reaproveita o fitness dos indivíduos que passam inalterados para a próxima
+        # geração (elites, filhos sem cruzamento nem mutação); útil com objetivos caros
+        self.cache_fitness = cache_fitness
+
+        # Único gerador de números aleatórios usado por todos os operadores
+        self.rng = np.random.default_rng(seed)
     
-    def initialize_population(self) -> List[np.ndarray]:
+    def initialize_population(self) -> np.ndarray:
         """
-        Inicializa a população com valores aleatórios dentro do intervalo.
+        Inicializa a população, uma matriz (population_size, num_variables), com valores
+        aleatórios dentro do intervalo.
         """
-        population = [np.random.uniform(self.min_value, self.max_value, self.num_variables)
-                for _ in range(self.population_size)]
-        
-        return population
+        return self.rng.uniform(self.min_value, self.max_value, (self.population_size, self.num_variables))
     
-    def evaluate_fitness(self, individual: np.ndarray) -> float:
+    def evaluate_fitness(self, population: np.ndarray) -> np.ndarray:
         """
-        Fitness do indivíduo da população.
+        Fitness de todos os indivíduos da população (ou de um único indivíduo).
         """
-        return np.sum(individual**2)
+        if population.ndim == 1:
+            return self.objective(population[np.newaxis])[0]
+        return self.objective(population)
+
+    def evaluate_fitness_cached(self, population: np.ndarray, cache: dict) -> Tuple[np.ndarray, int]:
+        """
+        Fitness da população consultando `cache` (bytes do indivíduo -> fitness); só os
+        indivíduos ausentes são avaliados. Retorna (fitness, número de avaliações feitas).
+        """
+        keys = [individual.tobytes() for individual in population]
+        fitness = np.array([cache.get(key, np.nan) for key in keys])
+        missing = np.flatnonzero(np.isnan(fitness))
+        if len(missing):
+            fitness[missing] = self.evaluate_fitness(population[missing])
+        return fitness, len(missing)
     
-    def tournament_selection(self, population: List[np.ndarray], fitness: List[float]) -> np.ndarray:
+    def tournament_selection(self, population: np.ndarray, fitness: np.ndarray, count: int) -> np.ndarray:
         """
-        Seleção por torneio - escolhe o melhor entre k indivíduos aleatórios.
+        Seleção por torneio - escolhe o melhor entre k indivíduos aleatórios, para `count`
+        torneios de uma vez. Os k competidores de cada torneio são distintos.
         """
-        tournament = random.sample(list(zip(population, fitness)), self.tournament_size)
-
-        return min(tournament, key=lambda x: x[1])[0]
+        candidates = sortear_competidores(self.rng, len(population), count, self.tournament_size)
+        winners = candidates[np.arange(count), np.argmin(fitness[candidates], axis=1)]
+        return population[winners]
     
-    def roulette_selection(self, population: List[np.ndarray], fitness: List[float]) -> np.ndarray:
+    def roulette_selection(self, population: np.ndarray, fitness: np.ndarray, count: int) -> np.ndarray:
         """
         Seleção por roleta. Implementado para comparar com o seleção por torneio (método acima).
         """
         # Transforma fitness de minimização para maximização
-        inverted_fitness = 1 / (1 + np.array(fitness))
-        total_fitness = np.sum(inverted_fitness)
-        probabilities = inverted_fitness / total_fitness
+        inverted_fitness = 1 / (1 + fitness)
+        probabilities = inverted_fitness / np.sum(inverted_fitness)
 
-        # Seleciona um índice baseado nas probabilidades
-        selected_idx = np.random.choice(len(population), p=probabilities)
+        # Seleciona os índices baseado nas probabilidades
+        selected = self.rng.choice(len(population), size=count, p=probabilities)
 
-        return population[selected_idx]
+        return population[selected]
     
-    def arithmetic_crossover(self, parent1, parent2) -> Tuple[np.ndarray, np.ndarray]:
+    def arithmetic_crossover(self, parents1: np.ndarray, parents2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Cruzamento aritmético para variáveis contínuas.
+        Cruzamento aritmético para variáveis contínuas, aplicado a cada par de pais com
+        probabilidade `crossover_rate`; os demais pares são copiados.
         """
-        # Fator de mistura aleatório
-        alpha = np.random.uniform(0, 1, self.num_variables)
+        # Fator de mistura aleatório; alpha = 1 mantém os pais
+        alpha = self.rng.uniform(0, 1, parents1.shape)
+        alpha[self.rng.random(len(parents1)) >= self.crossover_rate] = 1.0
 
         # Cria os filhos como combinações lineares dos pais
-        child1 = alpha * parent1 + (1 - alpha) * parent2
-        child2 = (1 - alpha) * parent1 + alpha * parent2
+        children1 = alpha * parents1 + (1 - alpha) * parents2
+        children2 = (1 - alpha) * parents1 + alpha * parents2
 
-        return child1, child2
+        return children1, children2
     
-    def gaussian_mutation(self, individual: np.ndarray) -> np.ndarray:
+    def gaussian_mutation(self, individuals: np.ndarray) -> np.ndarray:
         """
-        Mutação gaussiana para variáveis contínuas.
+        Mutação gaussiana para variáveis contínuas: cada gene sofre, com probabilidade
+        `mutation_rate`, uma pequena perturbação gaussiana e é mantido dentro dos limites.
         """
-        mutaded = individual.copy()
-        for i in range(self.num_variables):
-            if random.random() < self.mutation_rate:
-                mutaded[i] += np.random.normal(0, 0.5) # Aplica uma pequena perturbação gaussiana
-                mutaded[i] = np.clip(mutaded[i], self.min_value, self.max_value) # Garante que o novo valor continue dentro dos limites
+        mask = self.rng.random(individuals.shape) < self.mutation_rate
+        mutated = individuals + mask * self.rng.normal(0, 0.5, individuals.shape)
 
-        return mutaded
+        return np.clip(mutated, self.min_value, self.max_value)
     
-    def run(self) -> Tuple[np.ndarray, float, List[float]]:
+    def diversity(self, population: np.ndarray) -> float:
+        """
+        Diversidade da população: desvio padrão médio dos genes, relativo ao tamanho do intervalo.
+        """
+        return np.mean(np.std(population, axis=0)) / (self.max_value - self.min_value)
+
+    def stopping_criteria(self, population: np.ndarray, best_fitness_history: List[float],
+                          evaluations: int, elapsed: float) -> List[str]:
+        """
+        Critérios de parada satisfeitos pela geração atual:
+        - 'fitness_alvo': o melhor fitness chegou a `target_fitness`;
+        - 'estagnação': o melhor fitness melhorou no máximo `stagnation_tolerance` nas
+          últimas `stagnation_window` gerações;
+        - 'diversidade': a diversidade da população caiu abaixo de `diversity_threshold`;
+        - 'tempo' e 'avaliações': o orçamento de `time_limit` segundos ou de
+          `max_evaluations` avaliações da função objetivo se esgotou.
         """
-        Executa o algoritmo genético.
+        fired = []
+        if self.target_fitness is not None and best_fitness_history[-1] <= self.target_fitness:
+            fired.append('fitness_alvo')
+        if (self.stagnation_window is not None and len(best_fitness_history) > self.stagnation_window and
+                best_fitness_history[-self.stagnation_window - 1] - best_fitness_history[-1] <= self.stagnation_tolerance):
+            fired.append('estagnação')
+        if self.diversity_threshold is not None and self.diversity(population) < self.diversity_threshold:
+            fired.append('diversidade')
+        if self.time_limit is not None and elapsed >= self.time_limit:
+            fired.append('tempo')
+        if self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            fired.append('avaliações')
+        return fired
+
+    def run(self) -> Tuple[np.ndarray, float, List[float], List[float]]:
+        """
+        Executa o algoritmo genético até `max_generations` ou até algum critério de parada
+        ser satisfeito. Ao final, `self.convergence` registra os critérios que dispararam
+        (ou 'max_gerações'), a geração, o número de avaliações da função objetivo até então
+        e quantas avaliações o cache de fitness evitou.
         """
+        start = time.perf_counter()
         population = self.initialize_population()
+        # Fitness de cada individuo
+        fitness = self.evaluate_fitness(population)
+        evaluations = len(population)
+        evaluations_saved = 0
         best_fitness_history = []
         average_fitness_history = []
+        fired = []
+
+        num_children = self.population_size - self.elitism_count
+        num_pairs = (num_children + 1) // 2
 
         for generation in range(self.max_generations):
-            # Fitness de cada individuo
-            fitness = [self.evaluate_fitness(ind) for ind in population]
-            average_fitness = np.mean(fitness)
-            average_fitness_history.append(average_fitness)
+            average_fitness_history.append(np.mean(fitness))
             
             # Melhor fitness da atual geração
-            current_best_fitness = min(fitness)
-            best_fitness_history.append(current_best_fitness)
-
-            # Critério de parada (se o fitness já está muito pequeno)
-            #if current_best_fitness < 1e-6:
-                #break
+            best_fitness_history.append(np.min(fitness))
 
-            # Nova população
-            new_population = []
+            # Critérios de parada
+            fired = self.stopping_criteria(population, best_fitness_history, evaluations, time.perf_counter() - start)
+            if fired:
+                break
 
             # Elitismo: manter os melhores indíviduos de acordo com self.elitism_count
             elite_indices = np.argsort(fitness)[:self.elitism_count]
-            new_population.extend([population[i] for i in elite_indices])
-            
-            # Preenche a nova população
-            while len(new_population) < self.population_size:
-                parent1 = self.tournament_selection(population, fitness)
-                parent2 = self.tournament_selection(population, fitness)
-
-                # Cruzamento
-                if random.random() < self.crossover_rate:
-                    child1, child2 = self.arithmetic_crossover(parent1, parent2)
-                else:
-                    child1, child2 = parent1.copy(), parent2.copy()
-                
-                # Mutação
-                child1 = self.gaussian_mutation(child1)
-                child2 = self.gaussian_mutation(child2)
-
-                if len(new_population) < self.population_size:
-                    new_population.append(child1)
-                if len(new_population) < self.population_size:
-                    new_population.append(child2)
-            
+
+            # Preenche a nova população: seleção, cruzamento e mutação de todos os pares de uma vez
+            parents1 = self.tournament_selection(population, fitness, num_pairs)
+            parents2 = self.tournament_selection(population, fitness, num_pairs)
+            children1, children2 = self.arithmetic_crossover(parents1, parents2)
+            children = np.stack([children1, children2], axis=1).reshape(-1, self.num_variables)[:num_children]
+            children = self.gaussian_mutation(children)
+
             # Atualiza população para a próxima geração
-            population = new_population
-        
-        fitness = [self.evaluate_fitness(ind) for ind in population]
+            previous, previous_fitness = population, fitness
+            population = np.concatenate([population[elite_indices], children])
+            if self.cache_fitness:
+                # O cache guarda só a geração anterior, de onde vêm os indivíduos inalterados
+                cache = {individual.tobytes(): value for individual, value in zip(previous, previous_fitness)}
+                fitness, evaluated = self.evaluate_fitness_cached(population, cache)
+            else:
+                fitness, evaluated = self.evaluate_fitness(population), len(population)
+            evaluations += evaluated
+            evaluations_saved += len(population) - evaluated
+
+        self.convergence = {
+            'criteria': fired or ['max_gerações'],
+            'generation': len(best_fitness_history),
+            'evaluations': evaluations,
+            'evaluations_saved': evaluations_saved,
+        }
         best_index = np.argmin(fitness)
         best_individual = population[best_index]
         best_fitness = fitness[best_index]
 
         return best_individual, best_fitness, best_fitness_history, average_fitness_history
 
-def compare_solutions(params_variation: dict) -> List[dict]:
+# Colunas do arquivo com uma linha por execução de compare_solutions
+RUN_FIELDS = ['Configuração', 'Execução', 'Parâmetros', 'Semente', 'Fitness_Final', 'Gerações', 'Avaliações', 'Avaliações_Poupadas', 'Critérios', 'Tempo']
+
+# Valores críticos da distribuição t de Student (95%, bicaudal) para 1 a 30 graus de liberdade
+T_CRITICAL_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def confidence_interval(values: List[float]) -> Tuple[float, float]:
+    """
+    Intervalo de confiança de 95% para a média (distribuição t de Student).
+    """
+    values = np.asarray(values, dtype=float)
+    mean = np.mean(values)
+    if len(values) < 2:
+        return mean, mean
+    t = T_CRITICAL_95[len(values) - 2] if len(values) - 1 <= len(T_CRITICAL_95) else 1.96
+    margin = t * np.std(values, ddof=1) / np.sqrt(len(values))
+    return mean - margin, mean + margin
+
+
+def params_hash(params: dict) -> str:
+    """
+    Identificador curto de uma configuração; funções objetivo entram pelo nome.
+    """
+    encoded = json.dumps(params, sort_keys=True, default=lambda value: getattr(value, '__qualname__', repr(value)))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+def seed_label(seed: np.random.SeedSequence) -> str:
+    return f"{seed.entropy}:{'-'.join(str(key) for key in seed.spawn_key)}"
+
+
+def load_runs(runs_path: str) -> List[dict]:
+    """
+    Lê as execuções gravadas em `runs_path`. Um arquivo com outras colunas (de uma versão
+    anterior) não é misturado ao atual: é renomeado para `runs_path + '.old'` e ignorado.
+    """
+    if not os.path.exists(runs_path):
+        return []
+    with open(runs_path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        rows = list(reader) if reader.fieldnames == RUN_FIELDS else None
+    if rows is None:
+        os.replace(runs_path, runs_path + '.old')
+        return []
+    return [dict(row, **{'Execução': int(row['Execução']), 'Fitness_Final': float(row['Fitness_Final']),
+                         'Gerações': int(row['Gerações']), 'Avaliações': int(row['Avaliações']),
+                         'Avaliações_Poupadas': int(row['Avaliações_Poupadas']),
+                         'Tempo': float(row['Tempo'])}) for row in rows]
+
+
+def run_experiment(name: str, repetition: int, params: dict, seed: np.random.SeedSequence) -> dict:
+    """
+    Uma execução do algoritmo, com o seu próprio gerador de números aleatórios.
+    Roda em um processo do pool de compare_solutions.
+    """
+    start = time.perf_counter()
+    ga = GeneticAlgorithm(**params, seed=seed)
+    _, best_fitness, _, _ = ga.run()
+    return {
+        'Configuração': name,
+        'Execução': repetition,
+        'Parâmetros': params_hash(params),
+        'Semente': seed_label(seed),
+        'Fitness_Final': best_fitness,
+        'Gerações': ga.convergence['generation'],
+        'Avaliações': ga.convergence['evaluations'],
+        'Avaliações_Poupadas': ga.convergence['evaluations_saved'],
+        'Critérios': '+'.join(ga.convergence['criteria']),
+        'Tempo': time.perf_counter() - start,
+    }
+
+
+def compare_solutions(params_variation: dict, runs: int = 10, seed: int = 0,
+                      workers: int = None, runs_path: str = "runs.csv") -> List[dict]:
     """
     Compara a execução do algoritmo com diversos parâmetros.
+    - As execuções (configuração, repetição) são distribuídas em um pool de `workers`
+      processos; cada uma usa uma semente derivada de `seed` por `SeedSequence.spawn`,
+      então os resultados são reprodutíveis.
+    - Cada execução concluída é gravada em `runs_path` assim que termina; execuções já
+      registradas com a mesma configuração, os mesmos parâmetros (hash) e a mesma semente
+      são puladas, o que permite retomar uma comparação interrompida.
+    - Ao final, as execuções são ordenadas por (configuração, execução) antes de agregar
+      e de regravar `runs_path`, então o resumo não depende da ordem de término.
     """
+    seeds = np.random.SeedSequence(seed).spawn(len(params_variation))
+
+    # Só reaproveita execuções com a mesma configuração, parâmetros e semente
+    saved = {(record['Configuração'], record['Execução'], record['Parâmetros'], record['Semente']): record
+             for record in load_runs(runs_path)}
+
+    records = []
+    pending = []
+    for (name, params), config_seed in zip(params_variation.items(), seeds):
+        config_hash = params_hash(params)
+        for repetition, run_seed in enumerate(config_seed.spawn(runs)):
+            record = saved.get((name, repetition, config_hash, seed_label(run_seed)))
+            if record is None:
+                pending.append((name, repetition, params, run_seed))
+            else:
+                records.append(record)
+
+    with open(runs_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=RUN_FIELDS)
+        if f.tell() == 0:
+            writer.writeheader()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_experiment, *job) for job in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                writer.writerow(record)
+                f.flush()
+                records.append(record)
+
+    # Ordem fixa (configuração, execução), independente da ordem em que os processos
+    # terminaram: as médias e os intervalos saem idênticos com qualquer número de workers
+    order = {name: i for i, name in enumerate(params_variation)}
+    records.sort(key=lambda record: (order[record['Configuração']], record['Execução']))
+    if pending:
+        # Reescreve o arquivo nessa ordem, mantendo no final as execuções de outras configurações
+        used = {id(record) for record in records}
+        with open(runs_path + '.tmp', 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=RUN_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+            writer.writerows(record for record in saved.values() if id(record) not in used)
+        os.replace(runs_path + '.tmp', runs_path)
+
     results = []
     for name, params in params_variation.items():
-        fitness_history = []
-        generations_to_converge = []
-        
-        for _ in range(10):  # 10 execuções
-            ga = GeneticAlgorithm(**params)
-            _, best_fitness, history, _ = ga.run()
-            fitness_history.append(best_fitness)
-            generations_to_converge.append(len(history))
+        config_runs = [record for record in records if record['Configuração'] == name]
+        fitness_history = [record['Fitness_Final'] for record in config_runs]
+        generations_to_converge = [record['Gerações'] for record in config_runs]
+        evaluations = [record['Avaliações'] for record in config_runs]
+        evaluations_saved = [record['Avaliações_Poupadas'] for record in config_runs]
+        times = [record['Tempo'] for record in config_runs]
+        lower, upper = confidence_interval(fitness_history)
         
         results.append({
             'Configuração': name,
@@ -163,41 +400,50 @@ def compare_solutions(params_variation: dict) -> List[dict]:
             'Taxa_Mutação': params['mutation_rate'],
             'Tamanho_Torneio': params['tournament_size'],
             'Fitness_Final': np.mean(fitness_history),
-            'Gerações_Convergência': np.mean(generations_to_converge)
+            'Gerações_Convergência': np.mean(generations_to_converge),
+            'Avaliações_Médias': np.mean(evaluations),
+            'Avaliações_Poupadas_Médias': np.mean(evaluations_saved),
+            'Fitness_IC95_Inf': lower,
+            'Fitness_IC95_Sup': upper,
+            'Tempo_Médio': np.mean(times),
+            'Tempo_Total': np.sum(times),
         })
     
     return results
-    
 
-ga = GeneticAlgorithm(population_size=10, mutation_rate=0.5,
-                      tournament_size=3, crossover_rate=0.5,
-                      elitism_count=2, max_generations=100)
 
-populacao = ga.initialize_population()
+if __name__ == "__main__":
+    ga = GeneticAlgorithm(population_size=10, mutation_rate=0.5,
+                          tournament_size=3, crossover_rate=0.5,
+                          elitism_count=2, max_generations=100)
 
-best_solution, best_fitness, best_fitness_history, average_fitness_history = ga.run()
-print(f"Melhor solução encontrada: {best_solution}")
-print(f"Valor da função: {best_fitness}")
+    populacao = ga.initialize_population()
 
-plt.plot(best_fitness_history, label="Melhor fitness")
-plt.plot(average_fitness_history, label="Fitness Médio")
-plt.title("Convergência do Algoritmo Genético")
-plt.xlabel("Geração")
-plt.ylabel("Melhor Fitness")
-plt.legend()
-plt.show()
+    best_solution, best_fitness, best_fitness_history, average_fitness_history = ga.run()
+    print(f"Melhor solução encontrada: {best_solution}")
+    print(f"Valor da função: {best_fitness}")
 
+    plt.plot(best_fitness_history, label="Melhor fitness")
+    plt.plot(average_fitness_history, label="Fitness Médio")
+    plt.title("Convergência do Algoritmo Genético")
+    plt.xlabel("Geração")
+    plt.ylabel("Melhor Fitness")
+    plt.legend()
+    plt.show()
 
-# Variações a testar
-param_variations = {
-    'Padrão': {'population_size': 100, 'mutation_rate': 0.5, 'tournament_size': 3, 'crossover_rate': 0.2, 'elitism_count': 2, 'max_generations': 100},
-    'Alta taxa de mut.': {'population_size': 100, 'mutation_rate': 0.9, 'tournament_size': 3, 'crossover_rate': 0.2, 'elitism_count': 2, 'max_generations': 100},
-    'Baixa taxa de mut.': {'population_size': 100, 'mutation_rate': 0.1, 'tournament_size': 3, 'crossover_rate': 0.2, 'elitism_count': 2, 'max_generations': 100},
-    'Pop. Pequena': {'population_size': 20, 'mutation_rate': 0.5, 'tournament_size': 3, 'crossover_rate': 0.2, 'elitism_count': 2, 'max_generations': 100},
-    'Pop. Grande': {'population_size': 300, 'mutation_rate': 0.5, 'tournament_size': 3, 'crossover_rate': 0.2, 'elitism_count': 2, 'max_generations': 100},
-}
 
-results = compare_solutions(param_variations)
-results = pd.DataFrame(results)
-results.to_csv("results.csv")
+    # Critérios de parada comuns a todas as variações
+    stopping = {'target_fitness': 1e-6, 'stagnation_window': 20, 'stagnation_tolerance': 1e-9}
+
+    # Variações a testar
+    param_variations = {
+        'Padrão': {'population_size': 100, 'mutation_rate': 0.5, 'tournament_size': 3, 'crossover_rate': 0.2, 'elitism_count': 2, 'max_generations': 100, **stopping},
+        'Alta taxa de mut.': {'population_size': 100, 'mutation_rate': 0.9, 'tournament_size': 3, 'crossover_rate': 0.2, 'elitism_count': 2, 'max_generations': 100, **stopping},
+        'Baixa taxa de mut.': {'population_size': 100, 'mutation_rate': 0.1, 'tournament_size': 3, 'crossover_rate': 0.2, 'elitism_count': 2, 'max_generations': 100, **stopping},
+        'Pop. Pequena': {'population_size': 20, 'mutation_rate': 0.5, 'tournament_size': 3, 'crossover_rate': 0.2, 'elitism_count': 2, 'max_generations': 100, **stopping},
+        'Pop. Grande': {'population_size': 300, 'mutation_rate': 0.5, 'tournament_size': 3, 'crossover_rate': 0.2, 'elitism_count': 2, 'max_generations': 100, **stopping},
+    }
 
+    results = compare_solutions(param_variations)
+    results = pd.DataFrame(results)
+    results.to_csv("results.csv")
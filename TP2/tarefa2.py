@@ -1,7 +1,11 @@
-import random
+import os
+import time
+import numpy as np
 from tabulate import tabulate  # Certifique-se de instalar a biblioteca tabulate
+from torneio import sortear_competidores
 
 PENALIDADE = 1000  # Penalidade usada para desincentivar soluções que excedem a capacidade da mochila
+TAMANHO_TORNEIO = 3  # Competidores (distintos) por torneio na seleção de pais
 
 def ler_arquivo_mochila(nome_arquivo):
     with open(nome_arquivo, 'r') as f:
@@ -22,79 +26,145 @@ def ler_arquivo_mochila(nome_arquivo):
                 continue  # Ignora linhas vazias
     return capacidade, pesos, valores
 
-def calcular_fitness(individuo, pesos, valores, capacidade):
-    peso_total = sum(pesos[i] for i in range(len(individuo)) if individuo[i] == 1)
-    valor_total = sum(valores[i] for i in range(len(individuo)) if individuo[i] == 1)
-    
-    if peso_total > capacidade:
-        # Penalização por exceder a capacidade
-        return max(0, valor_total - (peso_total - capacidade) * PENALIDADE)
-    else:
-        return valor_total
+def calcular_fitness(populacao, pesos, valores, capacidade):
+    """
+    Fitness de todos os indivíduos de uma vez: peso e valor totais são o produto da
+    população (n_individuos, n_itens) pela matriz (n_itens, 2) de pesos e valores.
+    Também aceita um único indivíduo.
+    """
+    individuo = populacao.ndim == 1
+    populacao = np.atleast_2d(populacao)
+
+    # Produto em float64 (BLAS), com blocos de linhas de até ~4 MB convertidos por vez;
+    # é exato enquanto as somas forem menores que 2^53
+    matriz = np.stack([pesos, valores], axis=1).astype(np.float64)
+    linhas = max(1, (1 << 19) // populacao.shape[1])
+    totais = np.concatenate([populacao[i:i + linhas].astype(np.float64) @ matriz for i in range(0, len(populacao), linhas)])
+    peso_total, valor_total = np.rint(totais).astype(np.int64).T
+
+    # Penalização por exceder a capacidade
+    penalizado = np.maximum(0, valor_total - (peso_total - capacidade) * PENALIDADE)
+    fitness = np.where(peso_total > capacidade, penalizado, valor_total)
+    return fitness[0] if individuo else fitness
+
+def crossover(pais, gerador):
+    """
+    Cruzamento de ponto único para cada par de linhas consecutivas (pais[2i], pais[2i+1]),
+    com um ponto de corte aleatório por par. Retorna os filhos na mesma disposição.
+    A troca das caudas é feita por fatias, uma cópia contígua por filho.
+    """
+    n_pares, n_itens = len(pais) // 2, pais.shape[1]
+    pontos = gerador.integers(1, n_itens, n_pares) if n_itens > 1 else np.ones(n_pares, dtype=int)
+    filhos = pais.copy()
+    for i, ponto in enumerate(pontos.tolist()):
+        filhos[2 * i, ponto:] = pais[2 * i + 1, ponto:]
+        filhos[2 * i + 1, ponto:] = pais[2 * i, ponto:]
+    return filhos
 
-def crossover(pai1, pai2):
-    ponto = random.randint(1, len(pai1)-1)
-    filho1 = pai1[:ponto] + pai2[ponto:]
-    filho2 = pai2[:ponto] + pai1[ponto:]
-    return filho1, filho2
+def mutacao(populacao, taxa_mutacao, gerador):
+    """
+    Inverte cada bit da população com probabilidade `taxa_mutacao`. Em vez de sortear um
+    número por bit, sorteia as distâncias entre os bits invertidos, que seguem uma
+    distribuição geométrica; o custo é proporcional ao número de inversões.
+    """
+    populacao = np.ascontiguousarray(populacao)
+    if taxa_mutacao <= 0:
+        return populacao
+    tamanho = populacao.size
+    quantidade = int(tamanho * taxa_mutacao * 1.1) + 16
+    posicoes = np.cumsum(gerador.geometric(taxa_mutacao, quantidade)) - 1
+    while posicoes[-1] < tamanho:
+        mais = posicoes[-1] + np.cumsum(gerador.geometric(taxa_mutacao, quantidade))
+        posicoes = np.concatenate([posicoes, mais])
+    posicoes = posicoes[posicoes < tamanho]
 
-def mutacao(individuo, taxa_mutacao):
-    for i in range(len(individuo)):
-        if random.random() < taxa_mutacao:
-            individuo[i] = 1 - individuo[i]  # Flip do bit
-    return individuo
+    bits = populacao.reshape(-1)
+    bits[posicoes] ^= 1  # Flip do bit
+    return populacao
 
-def algoritmo_genetico_mochila(capacidade, pesos, valores, tamanho_populacao=50, geracoes=100, taxa_mutacao=0.01):
+def algoritmo_genetico_mochila(capacidade, pesos, valores, tamanho_populacao=50, geracoes=100, taxa_mutacao=0.01, semente=None):
+    """
+    Algoritmo genético para a mochila com a população em uma matriz numpy
+    (tamanho_populacao, n_itens) de uint8, um bit (0 ou 1) por item.
+    """
+    gerador = np.random.default_rng(semente)
+    pesos = np.asarray(pesos, dtype=np.int64)
+    valores = np.asarray(valores, dtype=np.int64)
     n_itens = len(pesos)
+    n_pares = (tamanho_populacao + 1) // 2
     
     # Inicialização da população
-    populacao = []
-    for _ in range(tamanho_populacao):
-        individuo = [random.randint(0, 1) for _ in range(n_itens)]
-        populacao.append(individuo)
+    populacao = gerador.integers(0, 2, (tamanho_populacao, n_itens), dtype=np.uint8)
     
     for geracao in range(geracoes):
         # Avaliação
-        fitness = [calcular_fitness(ind, pesos, valores, capacidade) for ind in populacao]
+        fitness = calcular_fitness(populacao, pesos, valores, capacidade)
         
         # Seleção de pais (por exemplo, torneio)
-        pais = selecao_por_torneio(populacao, fitness, tamanho_torneio=3)
+        pais = selecao_por_torneio(populacao, fitness, gerador, tamanho_torneio=TAMANHO_TORNEIO, quantidade=2 * n_pares)
         
         # Cruzamento e mutação
-        nova_geracao = []
-        for i in range(0, tamanho_populacao, 2):
-            pai1, pai2 = pais[i], pais[i+1]
-            filho1, filho2 = crossover(pai1, pai2)
-            filho1 = mutacao(filho1, taxa_mutacao)
-            filho2 = mutacao(filho2, taxa_mutacao)
-            nova_geracao.extend([filho1, filho2])
+        nova_geracao = crossover(pais, gerador)[:tamanho_populacao]
         
-        populacao = nova_geracao
+        populacao = mutacao(nova_geracao, taxa_mutacao, gerador)
     
     # Retorna a melhor solução encontrada
-    fitness = [calcular_fitness(ind, pesos, valores, capacidade) for ind in populacao]
-    melhor_idx = fitness.index(max(fitness))
+    fitness = calcular_fitness(populacao, pesos, valores, capacidade)
+    melhor_idx = np.argmax(fitness)
     return populacao[melhor_idx], fitness[melhor_idx]
 
-def selecao_por_torneio(populacao, fitness, tamanho_torneio=3):
-    pais = []
-    for _ in range(len(populacao)):
-        torneio = random.sample(list(zip(populacao, fitness)), tamanho_torneio)
-        melhor = max(torneio, key=lambda x: x[1])
-        pais.append(melhor[0])
-    return pais
+def selecao_por_torneio(populacao, fitness, gerador, tamanho_torneio=TAMANHO_TORNEIO, quantidade=None):
+    """
+    Seleciona `quantidade` pais (por padrão, o tamanho da população); cada um é o de maior
+    fitness entre `tamanho_torneio` indivíduos distintos sorteados.
+    """
+    if quantidade is None:
+        quantidade = len(populacao)
+    competidores = sortear_competidores(gerador, len(populacao), quantidade, tamanho_torneio)
+    vencedores = competidores[np.arange(quantidade), np.argmax(fitness[competidores], axis=1)]
+    return populacao[vencedores]
+
+def gerar_instancia(n_itens, semente=None):
+    """
+    Instância aleatória da mochila, com a capacidade igual à metade do peso total.
+    """
+    gerador = np.random.default_rng(semente)
+    pesos = gerador.integers(1, 1000, n_itens)
+    valores = gerador.integers(1, 1000, n_itens)
+    return int(pesos.sum()) // 2, pesos, valores
 
 def main():
-    capacidade, pesos, valores = ler_arquivo_mochila('C:\\Users\\alves.luiz\\Desktop\\Fund IA\\fundamentos-de-inteligencia-artificial\\TP2\\mochila.txt')
-    melhor_solucao, melhor_fitness = algoritmo_genetico_mochila(capacidade, pesos, valores)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Algoritmo genético para o problema da mochila")
+    parser.add_argument("--arquivo", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "mochila.txt"),
+                        help="Arquivo da instância (padrão: mochila.txt ao lado deste script)")
+    parser.add_argument("--itens", type=int, help="Usa uma instância aleatória com este número de itens em vez do arquivo")
+    parser.add_argument("--populacao", type=int, default=50, help="Tamanho da população (padrão: 50)")
+    parser.add_argument("--geracoes", type=int, default=100, help="Número de gerações (padrão: 100)")
+    parser.add_argument("--mutacao", type=float, default=0.01, help="Taxa de mutação por bit (padrão: 0.01)")
+    parser.add_argument("--semente", type=int, help="Semente do gerador de números aleatórios")
+    args = parser.parse_args()
+    if args.populacao < TAMANHO_TORNEIO:
+        parser.error(f"A população precisa ter pelo menos {TAMANHO_TORNEIO} indivíduos (o tamanho do torneio).")
+
+    if args.itens:
+        capacidade, pesos, valores = gerar_instancia(args.itens, args.semente)
+    else:
+        capacidade, pesos, valores = ler_arquivo_mochila(args.arquivo)
+    inicio = time.perf_counter()
+    melhor_solucao, melhor_fitness = algoritmo_genetico_mochila(capacidade, pesos, valores, args.populacao,
+                                                                args.geracoes, args.mutacao, args.semente)
+    tempo = time.perf_counter() - inicio
     melhor_fitness = float(melhor_fitness)
-    peso_total = sum(pesos[i] for i in range(len(melhor_solucao)) if melhor_solucao[i] == 1)
+    peso_total = int(melhor_solucao @ np.asarray(pesos, dtype=np.int64))
 
     # Dados para a tabela principal
     tabela_principal = [
         ["Capacidade da mochila", capacidade],
         ["Valor total", melhor_fitness],
-        ["Peso total", peso_total]
+        ["Peso total", peso_total],
+        ["Tempo (s)", round(tempo, 3)]
     ]
 
     # Dados para o grid de itens
@@ -110,9 +180,10 @@ def main():
     # Exibir a tabela principal
     print(tabulate(tabela_principal, headers=["Descrição", "Valor"], tablefmt="grid"))
 
-    # Exibir o grid de itens
-    print("\nItens:")
-    print(tabulate(tabela_itens, headers=["Item", "Status", "Peso", "Valor"], tablefmt="grid"))
+    # Exibir o grid de itens (só para instâncias lidas do arquivo)
+    if not args.itens:
+        print("\nItens:")
+        print(tabulate(tabela_itens, headers=["Item", "Status", "Peso", "Valor"], tablefmt="grid"))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
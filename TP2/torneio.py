@@ -0,0 +1,23 @@
+import numpy as np
+
+
+def sortear_competidores(gerador: np.random.Generator, tamanho_populacao: int, quantidade: int,
+                         tamanho_torneio: int) -> np.ndarray:
+    """
+    Sorteia os índices dos competidores de `quantidade` torneios de uma vez, uma matriz
+    (quantidade, tamanho_torneio) em que os competidores de cada torneio são distintos.
+    O j-ésimo competidor é sorteado entre os `tamanho_populacao - j` índices restantes e
+    depois deslocado para pular, em ordem crescente, os já escolhidos na mesma linha;
+    o custo é fixo, sem sorteios repetidos.
+    """
+    if not 0 < tamanho_torneio <= tamanho_populacao:
+        raise ValueError(
+            f"O tamanho do torneio ({tamanho_torneio}) deve estar entre 1 e o tamanho da população ({tamanho_populacao})"
+        )
+    competidores = np.empty((quantidade, tamanho_torneio), dtype=np.int64)
+    for j in range(tamanho_torneio):
+        sorteados = gerador.integers(0, tamanho_populacao - j, quantidade)
+        for escolhidos in np.sort(competidores[:, :j], axis=1).T:
+            sorteados += sorteados >= escolhidos
+        competidores[:, j] = sorteados
+    return competidores